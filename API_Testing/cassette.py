@@ -0,0 +1,169 @@
+import os
+import json
+import time
+import base64
+import threading
+from datetime import timedelta
+from urllib.parse import parse_qsl, urlencode, urlsplit
+import requests
+
+
+RECORD = "record"
+REPLAY = "replay"
+FORMAT_VERSION = 1
+
+
+class CassetteMiss(requests.RequestException):
+    """Replay found no recorded response for a request (the test's traffic changed)."""
+
+
+def _canonical_body(prepared):
+    body = prepared.body
+    if body is None:
+        return None
+    if isinstance(body, bytes):
+        body = body.decode("utf-8", errors="replace")
+    content_type = prepared.headers.get("Content-Type", "")
+    if content_type.startswith("application/x-www-form-urlencoded"):
+        return urlencode(sorted(parse_qsl(body, keep_blank_values=True)))
+    if content_type.startswith("application/json"):
+        try:
+            return json.dumps(json.loads(body), sort_keys=True, separators=(",", ":"))
+        except ValueError:
+            pass
+    return body
+
+
+def request_key(base, method, url, req_kwargs):
+    """Lookup key: method, path relative to the base URL, sorted query, canonical body, authenticated?
+
+    The credential itself is not part of the key (a recording made with a user
+    token replays with Basic auth), only whether the call was authenticated.
+    """
+    headers = req_kwargs.get("headers") or {}
+    prepared = requests.Request(
+        method,
+        url,
+        params=req_kwargs.get("params"),
+        data=req_kwargs.get("data"),
+        json=req_kwargs.get("json"),
+        headers=headers,
+    ).prepare()
+    parts = urlsplit(prepared.url)
+    path = prepared.url[len(base):] if prepared.url.startswith(base) else f"{parts.scheme}://{parts.netloc}{parts.path}"
+    path = urlsplit(path).path or "/"
+    authenticated = req_kwargs.get("auth") is not None or "Authorization" in headers
+    return json.dumps(
+        [method.upper(), path, sorted(parse_qsl(parts.query, keep_blank_values=True)), _canonical_body(prepared), authenticated],
+        separators=(",", ":"),
+    )
+
+
+class Cassette:
+    """JSON-lines recording of API exchanges, replayed from an in-memory index.
+
+    The first line is a header (format version, TEST_RUN_ID, base URL); every other
+    line is one exchange: the request key (see `request_key`) and the status,
+    reason, Content-Type and body of the response. Bodies are stored as text, or
+    base64 when they are not UTF-8.
+
+    - record: exchanges are appended (and flushed) as they happen.
+    - replay: the file is indexed by key; identical requests get their recorded
+      responses in order, the last one repeating once they run out. A request that
+      was never recorded raises CassetteMiss instead of touching the network.
+    """
+
+    def __init__(self, path, mode=REPLAY, run_id=None):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown cassette mode '{mode}' (use '{RECORD}' or '{REPLAY}')")
+        self.path = path
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._index = {}
+        self._cursors = {}
+        self.header = {}
+        self.hits = 0
+        self.recorded = 0
+        self._file = None
+        if mode == RECORD:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._file = open(path, "w")
+            self.header = {"cassette": FORMAT_VERSION, "run_id": run_id, "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S%z")}
+            self._write(self.header)
+        else:
+            self._load()
+
+    @property
+    def replaying(self):
+        return self.mode == REPLAY
+
+    def _load(self):
+        with open(self.path) as f:
+            for number, line in enumerate(f):
+                entry = json.loads(line)
+                if number == 0 and "cassette" in entry:
+                    self.header = entry
+                    continue
+                self._index.setdefault(entry["key"], []).append(entry["response"])
+
+    def _write(self, entry):
+        self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self._file.flush()
+
+    def record(self, base, method, url, req_kwargs, resp):
+        content = resp.content
+        try:
+            body = {"text": content.decode("utf-8")}
+        except UnicodeDecodeError:
+            body = {"base64": base64.b64encode(content).decode("ascii")}
+        entry = {
+            "key": request_key(base, method, url, req_kwargs),
+            "response": {
+                "status": resp.status_code,
+                "reason": resp.reason,
+                "content_type": resp.headers.get("Content-Type"),
+                **body,
+            },
+        }
+        with self._lock:
+            self._write(entry)
+            self.recorded += 1
+
+    def play(self, base, method, url, req_kwargs):
+        key = request_key(base, method, url, req_kwargs)
+        with self._lock:
+            responses = self._index.get(key)
+            if not responses:
+                raise CassetteMiss(f"No recorded response in {self.path} for {key}")
+            cursor = self._cursors.get(key, 0)
+            self._cursors[key] = cursor + 1
+            self.hits += 1
+        recorded = responses[min(cursor, len(responses) - 1)]
+
+        resp = requests.Response()
+        resp.status_code = recorded["status"]
+        resp.reason = recorded.get("reason")
+        if recorded.get("content_type"):
+            resp.headers["Content-Type"] = recorded["content_type"]
+        resp._content = (
+            recorded["text"].encode("utf-8") if "text" in recorded else base64.b64decode(recorded["base64"])
+        )
+        resp.encoding = "utf-8"
+        resp.url = url
+        resp.elapsed = timedelta(0)
+        return resp
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def read_header(path):
+    """The cassette's header line ({} when missing or unreadable)."""
+    try:
+        with open(path) as f:
+            entry = json.loads(f.readline())
+        return entry if "cassette" in entry else {}
+    except (OSError, ValueError):
+        return {}
@@ -0,0 +1,505 @@
+import os
+import json
+import time
+import asyncio
+import threading
+from collections import deque
+import allure
+import requests
+from http.cookiejar import DefaultCookiePolicy
+
+from API_Testing.cassette import Cassette
+from API_Testing.latency import LatencyRecorder, TimingHTTPAdapter, reset_connect_timing, take_connect_timing
+from API_Testing.retry import RetryPolicy
+
+
+DEFAULT_POOL_CONNECTIONS = 4
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 30.0
+DEFAULT_CAPTURE_SIZE = 20
+# unread streamed bodies up to this size are read in full when evicted, so their
+# connection can be reused; larger ones are cheaper to drop along with the socket
+DRAIN_MAX_BYTES = 64 * 1024
+
+CAPTURE_ALWAYS = "always"
+CAPTURE_ON_FAILURE = "failure"
+CAPTURE_OFF = "off"
+
+
+class _RejectAllCookies(DefaultCookiePolicy):
+    """Cookie policy that never stores cookies, keeping a shared session stateless."""
+
+    def set_ok(self, cookie, request):
+        return False
+
+
+class StreamEvictedError(requests.RequestException):
+    """The body of a streamed response was dropped unread to free its connection."""
+
+
+class _EvictedRaw:
+    """Stands in for the raw stream of an evicted response, so reading it fails loudly."""
+
+    def __init__(self, url):
+        self._url = url
+
+    def stream(self, amt=2 ** 16, decode_content=None):
+        raise StreamEvictedError(
+            f"body of {self._url} was discarded unread (more than pool_maxsize streamed "
+            f"responses were left unread, or the test had ended); read it earlier or raise "
+            f"--api-capture-bytes"
+        )
+        yield  # pragma: no cover - makes this a generator like urllib3's stream()
+
+    def close(self):
+        pass
+
+    def release_conn(self):
+        pass
+
+
+def _evict_stream(resp):
+    """Free the connection held by an unread streamed body.
+
+    Small bodies are read in full (`resp.content` then works as if nothing
+    happened); larger ones are dropped with their socket and reading them raises
+    StreamEvictedError rather than returning the captured prefix.
+    """
+    if resp._content_consumed:
+        return
+    try:
+        length = int(resp.headers.get("Content-Length", ""))
+    except ValueError:
+        length = None
+    if length is not None and length <= DRAIN_MAX_BYTES:
+        try:
+            resp.content
+            return
+        except Exception:
+            pass
+    resp.close()
+    resp.raw = _EvictedRaw(resp.url)
+
+
+class _PrefixedRaw:
+    """urllib3 response proxy that replays an already-read body prefix before the rest.
+
+    Lets the wrapper peek at the first bytes of a streamed body for reporting while
+    requests still decodes the full body lazily (on `resp.content`/`.json()`).
+    """
+
+    def __init__(self, raw, prefix: bytes):
+        self._raw = raw
+        self._prefix = prefix
+
+    def stream(self, amt=2 ** 16, decode_content=None):
+        if self._prefix:
+            prefix, self._prefix = self._prefix, b""
+            yield prefix
+        yield from self._raw.stream(amt, decode_content=True)
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+
+class ApiSessionWrapper:
+    """Wrap requests.Session to auto-attach requests/responses to Allure.
+
+    Usage in tests: pass the `api` fixture and call `api.get('/api/..')` — the
+    wrapper will preprend the base_url and attach the request+response JSON to Allure.
+
+    The underlying session keeps a keep-alive connection pool, so a single wrapper
+    can be shared by a whole test session:
+
+    - pool_connections: number of per-host pools to cache.
+    - pool_maxsize: connections kept alive per host (raise it for concurrent callers).
+    - timeout: default (connect, read) timeout applied when a call does not pass one.
+    - persist_cookies: when False, cookies set by the server (e.g. after a login) are
+      dropped so one test cannot leak an authenticated session into the next.
+    - capture: "always" attaches every exchange to Allure as it happens; "failure"
+      only keeps the last `capture_size` exchanges in a ring buffer and serializes
+      them when `attach_exchanges()` is called (the conftest does so on test failure);
+      "off" records nothing (e.g. for load generation).
+    - capture_bytes: when set, responses are streamed and only the first N decoded
+      bytes are read up front for reporting; the full body is downloaded and decoded
+      only if the test reads it. Unread bodies are discarded by `close_streams()`;
+      at most `pool_maxsize` are held open, the oldest unread one being evicted
+      when another arrives. Eviction reads bodies up to DRAIN_MAX_BYTES in full (they
+      stay readable and the connection goes back to the pool); larger ones are
+      closed and reading them raises StreamEvictedError.
+    - retry: optional RetryPolicy; idempotent calls that hit a transient status or
+      connection error are retried with backoff, and each retry is listed under
+      "retries" in the response's Allure attachment. When the last attempt fails
+      without a response, the raised exception carries them as `_retries` and
+      they are attached on their own. None sends every call once.
+    - cassette: optional Cassette; in record mode every final response is appended
+      to it (bodies are read in full, so capture_bytes saves nothing), in replay
+      mode responses come from it and the network is never touched.
+
+    Every call is timed into `self.latency` (connect / server / total per endpoint).
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        timeout=(DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT),
+        persist_cookies: bool = True,
+        capture: str = CAPTURE_ALWAYS,
+        capture_size: int = DEFAULT_CAPTURE_SIZE,
+        capture_bytes: int = None,
+        retry: RetryPolicy = None,
+        cassette: Cassette = None,
+    ):
+        self._base = base_url.rstrip("/")
+        self._timeout = timeout
+        self.pool_maxsize = pool_maxsize
+        self._session = requests.Session()
+        adapter = TimingHTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        if not persist_cookies:
+            self._session.cookies.set_policy(_RejectAllCookies())
+        self.capture = capture
+        self.exchanges = deque(maxlen=capture_size)
+        self.capture_bytes = capture_bytes
+        self._settings = dict(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            timeout=timeout,
+            capture=capture,
+            capture_size=capture_size,
+            capture_bytes=capture_bytes,
+            retry=retry,
+            cassette=cassette,
+        )
+        self.retry = retry
+        self.cassette = cassette
+        self._open_streams = []
+        self._streams_lock = threading.Lock()
+        self.latency = LatencyRecorder()
+        self.last_response = None
+
+    @property
+    def base_url(self):
+        return self._base
+
+    def request(self, method, path, **kwargs):
+        url = self._url(path)
+        try:
+            resp = self._send(method, url, kwargs)
+        except requests.RequestException as e:
+            self._record_error(method, url, kwargs, e)
+            raise
+        self._record(method, url, kwargs, resp)
+        return resp
+
+    def _record(self, method, url, req_kwargs, resp):
+        self.last_response = resp
+        if self.capture == CAPTURE_OFF:
+            return
+        if self.capture == CAPTURE_ON_FAILURE:
+            # defer all serialization; the deque drops the oldest exchange when full
+            self.exchanges.append((method, url, req_kwargs, resp))
+        else:
+            self._attach_response(method, url, req_kwargs, resp)
+
+    def _record_error(self, method, url, req_kwargs, error):
+        """Attach the retries made before a call failed without any response."""
+        retries = getattr(error, "_retries", None)
+        if not retries or self.capture == CAPTURE_OFF:
+            return
+        try:
+            attach = {
+                "method": method,
+                "url": url,
+                "request_params": req_kwargs.get("params"),
+                "error": f"{type(error).__name__}: {error}",
+                "retries": retries,
+            }
+            allure.attach(
+                json.dumps(attach, default=str, indent=2),
+                name=f"{method} {url}",
+                attachment_type=allure.attachment_type.JSON,
+            )
+        except Exception:
+            pass
+
+    def _url(self, path):
+        return path if path.startswith("http") else f"{self._base}{path if path.startswith('/') else '/' + path}"
+
+    def _send(self, method, url, req_kwargs):
+        """Perform the HTTP call (or replay it); no Allure side effects (safe from worker threads)."""
+        if self.cassette is not None and self.cassette.replaying:
+            return self.cassette.play(self._base, method, url, req_kwargs)
+        resp = self._send_live(method, url, req_kwargs)
+        if self.cassette is not None:
+            self.cassette.record(self._base, method, url, req_kwargs, resp)
+        return resp
+
+    def _send_live(self, method, url, req_kwargs):
+        """Perform the HTTP call, retrying per `self.retry`."""
+        req_kwargs.setdefault("timeout", self._timeout)
+        if self.retry is None:
+            return self._send_once(method, url, req_kwargs)
+
+        retries = []
+        # once per call: a half-open breaker lets one call (with its retries) through
+        self.retry.before_call()
+        failed = True
+        try:
+            while True:
+                resp, error = None, None
+                try:
+                    resp = self._send_once(method, url, req_kwargs)
+                except requests.RequestException as e:
+                    error = e
+                transient = self.retry.is_transient(resp.status_code if resp is not None else None, error)
+                delay = self.retry.next_delay(method, len(retries), resp) if transient else None
+                if delay is None:
+                    failed = transient
+                    if error is not None:
+                        if retries:
+                            error._retries = retries
+                        raise error
+                    if retries:
+                        resp._retries = retries
+                    return resp
+                retries.append({
+                    "attempt": len(retries) + 1,
+                    "reason": type(error).__name__ if error is not None else f"HTTP {resp.status_code}",
+                    "delay_s": round(delay, 3),
+                })
+                if resp is not None:
+                    resp.close()
+                self.retry.sleep(delay)
+        finally:
+            # whatever was raised: a half-open trial must not stay in flight forever
+            self.retry.record_outcome(failed=failed)
+
+    def _send_once(self, method, url, req_kwargs):
+        """Perform and time a single HTTP attempt."""
+        reset_connect_timing()
+        started = time.perf_counter()
+        try:
+            if not self.capture_bytes or "stream" in req_kwargs:
+                resp = self._session.request(method, url, **req_kwargs)
+            else:
+                resp = self._session.request(method, url, stream=True, **req_kwargs)
+                self._peek(resp)
+        except requests.RequestException:
+            self.latency.record(method, url, "error", time.perf_counter() - started, connect=take_connect_timing())
+            raise
+        self.latency.record(
+            method,
+            url,
+            resp.status_code,
+            time.perf_counter() - started,
+            elapsed=resp.elapsed.total_seconds(),
+            connect=take_connect_timing(),
+        )
+        return resp
+
+    def _peek(self, resp):
+        """Read up to `capture_bytes` of the body, leaving the remainder on the socket."""
+        try:
+            prefix = resp.raw.read(self.capture_bytes, decode_content=True) or b""
+        except Exception:
+            return
+        resp._capture_prefix = prefix
+        if len(prefix) < self.capture_bytes:
+            # the whole body fit under the cap: keep it and hand the connection back
+            resp._content = prefix
+            resp._content_consumed = True
+            resp.raw.release_conn()
+        else:
+            resp.raw = _PrefixedRaw(resp.raw, prefix)
+            with self._streams_lock:
+                # bodies read since have handed their connection back already
+                self._open_streams = [r for r in self._open_streams if not r._content_consumed]
+                if len(self._open_streams) >= self.pool_maxsize:
+                    # unread bodies each pin a socket; never hold more than the pool
+                    _evict_stream(self._open_streams.pop(0))
+                self._open_streams.append(resp)
+
+    def close_streams(self):
+        """Close streamed responses whose body was never read, freeing their sockets."""
+        with self._streams_lock:
+            streams, self._open_streams = self._open_streams, []
+        for resp in streams:
+            _evict_stream(resp)
+
+    def session(self):
+        """A wrapper with its own cookie jar, for flows that rely on a login session.
+
+        It shares this wrapper's settings, retry policy, cassette, latency samples
+        and failure-capture buffer; close it (or use it as a context manager) when done.
+        """
+        child = ApiSessionWrapper(self._base, persist_cookies=True, **self._settings)
+        child.latency = self.latency
+        child.exchanges = self.exchanges
+        return child
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close_streams()
+        self.close()
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def put(self, path, **kwargs):
+        return self.request("PUT", path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request("DELETE", path, **kwargs)
+
+    def close(self):
+        try:
+            self._session.close()
+        except Exception:
+            pass
+
+    def reset_exchanges(self):
+        self.exchanges.clear()
+
+    def attach_exchanges(self):
+        """Serialize buffered exchanges (oldest first) to Allure and empty the buffer."""
+        while self.exchanges:
+            self._attach_response(*self.exchanges.popleft())
+
+    def _attach_response(self, method, url, req_kwargs, resp):
+        try:
+            # Build a compact JSON-friendly object with request/response details
+            attach = {
+                "method": method,
+                "url": url,
+                "request_headers": {k: v for k, v in (req_kwargs.get("headers") or {}).items()},
+                "request_params": req_kwargs.get("params"),
+                "request_json": req_kwargs.get("json"),
+                "request_data": req_kwargs.get("data"),
+                "status_code": resp.status_code,
+            }
+            retries = getattr(resp, "_retries", None)
+            if retries:
+                attach["retries"] = retries
+            prefix = getattr(resp, "_capture_prefix", None)
+            if prefix is not None and not resp._content_consumed:
+                # body not read by the test yet: report the captured prefix only
+                attach["response_text"] = prefix.decode(resp.encoding or "utf-8", errors="replace") + "..."
+            else:
+                # Try to parse JSON response body, otherwise include text (trimmed)
+                try:
+                    attach["response_body"] = resp.json()
+                except Exception:
+                    attach["response_text"] = (resp.text[:10000] + "...") if len(resp.text) > 10000 else resp.text
+
+            allure.attach(
+                json.dumps(attach, default=str, indent=2),
+                name=f"{method} {url}",
+                attachment_type=allure.attachment_type.JSON,
+            )
+        except Exception:
+            # best-effort; do not raise
+            pass
+
+
+class AsyncApiSessionWrapper:
+    """Asyncio counterpart of ApiSessionWrapper for concurrent fan-out calls.
+
+    Exposes the same `get/post/put/delete` coroutines and Allure attachments. The
+    HTTP calls run on worker threads over the wrapped client's connection pool,
+    while attachments are made back on the event loop thread so they land on the
+    current test. At most `concurrency` calls are in flight at once (defaults to the
+    client's pool size so every in-flight call gets a kept-alive connection).
+
+    Usage in tests:
+
+        async def scenario():
+            return await async_api.gather(
+                async_api.post('/api/projects/create', data=..., auth=auth) for ...
+            )
+        responses = asyncio.run(scenario())
+    """
+
+    def __init__(self, client: ApiSessionWrapper, concurrency: int = None):
+        self._client = client
+        self._concurrency = concurrency or client.pool_maxsize
+        self._semaphores = {}
+
+    @property
+    def base_url(self):
+        return self._client.base_url
+
+    @property
+    def last_response(self):
+        return self._client.last_response
+
+    def _semaphore(self):
+        # asyncio primitives are bound to the loop they are first used on and
+        # tests typically call asyncio.run() more than once, so keep one per loop
+        loop = asyncio.get_running_loop()
+        sem = self._semaphores.get(loop)
+        if sem is None:
+            self._semaphores = {loop: asyncio.Semaphore(self._concurrency)}
+            sem = self._semaphores[loop]
+        return sem
+
+    async def request(self, method, path, **kwargs):
+        url = self._client._url(path)
+        try:
+            async with self._semaphore():
+                resp = await asyncio.to_thread(self._client._send, method, url, kwargs)
+        except requests.RequestException as e:
+            self._client._record_error(method, url, kwargs, e)
+            raise
+        self._client._record(method, url, kwargs, resp)
+        return resp
+
+    async def get(self, path, **kwargs):
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path, **kwargs):
+        return await self.request("POST", path, **kwargs)
+
+    async def put(self, path, **kwargs):
+        return await self.request("PUT", path, **kwargs)
+
+    async def delete(self, path, **kwargs):
+        return await self.request("DELETE", path, **kwargs)
+
+    async def gather(self, calls, return_exceptions=False):
+        """Run an iterable of request coroutines concurrently, preserving order."""
+        return await asyncio.gather(*calls, return_exceptions=return_exceptions)
+
+
+def _float_env(name, default):
+    try:
+        return float(os.environ[name])
+    except (KeyError, ValueError):
+        return default
+
+
+def client_settings_from_env():
+    """Pool/timeout settings for the shared client, read from environment variables.
+
+    API_POOL_SIZE, API_CONNECT_TIMEOUT, API_READ_TIMEOUT, API_CAPTURE,
+    API_CAPTURE_SIZE and API_CAPTURE_BYTES override the defaults.
+    """
+    return {
+        "capture_bytes": int(_float_env("API_CAPTURE_BYTES", 0)) or None,
+        "capture": os.environ.get("API_CAPTURE", CAPTURE_ALWAYS),
+        "capture_size": int(_float_env("API_CAPTURE_SIZE", DEFAULT_CAPTURE_SIZE)),
+        "pool_maxsize": int(_float_env("API_POOL_SIZE", DEFAULT_POOL_MAXSIZE)),
+        "timeout": (
+            _float_env("API_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT),
+            _float_env("API_READ_TIMEOUT", DEFAULT_READ_TIMEOUT),
+        ),
+    }
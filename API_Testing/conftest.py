@@ -1,10 +1,30 @@
 import os
 import json
+import time
 import allure
 import pytest
-import requests
+import unittest
+import warnings
 from requests.auth import HTTPBasicAuth
 
+from API_Testing.cassette import RECORD, REPLAY, Cassette, read_header
+from API_Testing.client import (
+    CAPTURE_ALWAYS,
+    CAPTURE_OFF,
+    CAPTURE_ON_FAILURE,
+    ApiSessionWrapper,
+    AsyncApiSessionWrapper,
+    client_settings_from_env,
+)
+from API_Testing.latency import LatencyRecorder
+from API_Testing.projects import ProjectFactory
+from API_Testing.retry import retry_policy_from_env
+from API_Testing.tokens import generate_user_token, revoke_user_token
+import Common.naming
+from Common.naming import RUN_ID, worker_id
+from Common.readiness import DEFAULT_READY_TIMEOUT, record_startup, wait_until_ready
+from Common.reporting import per_worker_path, write_json
+
 
 def pytest_addoption(parser):
     parser.addoption(
@@ -13,14 +33,203 @@ def pytest_addoption(parser):
         default=None,
         help="Base URL for API tests (overrides BASE_URL env var)",
     )
+    parser.addoption(
+        "--ready-timeout",
+        action="store",
+        type=float,
+        default=None,
+        help="Seconds to wait for SonarQube to be UP and GREEN before running tests (overrides READY_TIMEOUT, default 300)",
+    )
+    parser.addoption(
+        "--skip-ready-check",
+        action="store_true",
+        default=False,
+        help="Do not wait for SonarQube readiness at session start",
+    )
+    parser.addoption(
+        "--no-token-auth",
+        action="store_true",
+        default=False,
+        help="Authenticate API calls with Basic auth instead of a session user token (or API_TOKEN_AUTH=false)",
+    )
+    parser.addoption(
+        "--fake-sonarqube",
+        action="store_true",
+        default=False,
+        help="Run API tests against an in-process SonarQube stand-in instead of --base-url (or FAKE_SONARQUBE=true)",
+    )
+    parser.addoption(
+        "--api-pool-size",
+        action="store",
+        type=int,
+        default=None,
+        help="Keep-alive connections per host for the shared API client (overrides API_POOL_SIZE)",
+    )
+    parser.addoption(
+        "--api-timeout",
+        action="store",
+        type=float,
+        default=None,
+        help="Read timeout in seconds for API calls (overrides API_READ_TIMEOUT)",
+    )
+    parser.addoption(
+        "--api-concurrency",
+        action="store",
+        type=int,
+        default=None,
+        help="Max in-flight calls for the async API client (defaults to the pool size)",
+    )
+    parser.addoption(
+        "--api-capture",
+        action="store",
+        choices=[CAPTURE_ALWAYS, CAPTURE_ON_FAILURE, CAPTURE_OFF],
+        default=None,
+        help="Attach every API exchange to Allure ('always') or only the last few on test failure ('failure'); overrides API_CAPTURE",
+    )
+    parser.addoption(
+        "--api-capture-size",
+        action="store",
+        type=int,
+        default=None,
+        help="Exchanges kept in the ring buffer for --api-capture=failure (overrides API_CAPTURE_SIZE)",
+    )
+    parser.addoption(
+        "--api-capture-bytes",
+        action="store",
+        type=int,
+        default=None,
+        help="Stream API responses and capture only the first N bytes for reporting (overrides API_CAPTURE_BYTES)",
+    )
+    parser.addoption(
+        "--api-retries",
+        action="store",
+        type=int,
+        default=None,
+        help="Retries per idempotent API call on 502/503/504 or connection errors; 0 disables (overrides API_RETRIES)",
+    )
+    parser.addoption(
+        "--api-retry-budget",
+        action="store",
+        type=int,
+        default=None,
+        help="Max retries across the whole session (overrides API_RETRY_BUDGET)",
+    )
+    parser.addoption(
+        "--cassette",
+        action="store",
+        default=None,
+        help="JSON-lines cassette of API exchanges to record or replay (overrides API_CASSETTE)",
+    )
+    parser.addoption(
+        "--cassette-mode",
+        action="store",
+        choices=[RECORD, REPLAY],
+        default=None,
+        help="'record' live exchanges into --cassette or 'replay' them without network (default replay; overrides API_CASSETTE_MODE)",
+    )
+    parser.addoption(
+        "--latency-report",
+        action="store",
+        default=os.path.join("allure-results", "api-latency.json"),
+        help="Where to write per-endpoint API latency percentiles at session end",
+    )
+    parser.addoption(
+        "--health-sample-interval",
+        action="store",
+        type=float,
+        default=None,
+        help="Sample /api/system/health every N seconds in the background while tests run (off by default)",
+    )
+    parser.addoption(
+        "--health-sample-metrics",
+        action="store_true",
+        default=False,
+        help="Also time /api/monitoring/metrics on each health sample",
+    )
+    group = parser.getgroup("scaling", "Project search scaling test (tests marked 'scaling')")
+    group.addoption("--scaling", action="store_true", default=False, help="Run tests marked 'scaling' (skipped otherwise)")
+    group.addoption(
+        "--scaling-sizes",
+        action="store",
+        default="10,1000,10000",
+        help="Comma-separated project counts to seed and measure",
+    )
+    group.addoption(
+        "--scaling-tolerance",
+        action="store",
+        type=float,
+        default=0.2,
+        help="Allowed growth exponent above linear (t ~ n^(1+tolerance)) before failing",
+    )
+    group = parser.getgroup("load", "SonarQube API load generation (tests marked 'load')")
+    group.addoption("--load", action="store_true", default=False, help="Run tests marked 'load' (skipped otherwise)")
+    group.addoption("--load-duration", action="store", type=float, default=10.0, help="Seconds to generate load")
+    group.addoption("--load-concurrency", action="store", type=int, default=8, help="Concurrent worker threads")
+    group.addoption(
+        "--load-rate",
+        action="store",
+        type=float,
+        default=None,
+        help="Target requests/second across all workers (default: as fast as possible)",
+    )
+    group.addoption(
+        "--load-mix",
+        action="store",
+        default=None,
+        help="Weighted request mix, e.g. 'search=6,health=3,login=1'",
+    )
+    group.addoption("--slo-p95-ms", action="store", type=float, default=None, help="Fail the load run if p95 latency exceeds this")
+    group.addoption(
+        "--slo-error-rate",
+        action="store",
+        type=float,
+        default=None,
+        help="Fail the load run if the error rate (0-1) exceeds this",
+    )
+
+
+def _cassette_path(config):
+    path = config.getoption("--cassette") or os.environ.get("API_CASSETTE")
+    # one cassette per xdist worker
+    return per_worker_path(path) if path else path
+
+
+def _cassette_mode(config):
+    return config.getoption("--cassette-mode") or os.environ.get("API_CASSETTE_MODE") or REPLAY
+
+
+def _replaying(config):
+    return bool(_cassette_path(config)) and _cassette_mode(config) == REPLAY
+
+
+@pytest.fixture(scope="session")
+def fake_sonarqube(pytestconfig):
+    """Start the in-process FakeSonarQube when --fake-sonarqube/FAKE_SONARQUBE is set, else None."""
+    enabled = pytestconfig.getoption("--fake-sonarqube") or (
+        os.environ.get("FAKE_SONARQUBE", "false").lower() == "true"
+    )
+    if not enabled or _replaying(pytestconfig):
+        yield None
+        return
+    # opt-in helpers are imported only when enabled to keep collection lean
+    from API_Testing.fake_sonarqube import FakeSonarQube
+
+    server = FakeSonarQube().start()
+    try:
+        yield server
+    finally:
+        server.stop()
 
 
 @pytest.fixture(scope="session")
-def base_url(pytestconfig):
+def base_url(pytestconfig, fake_sonarqube):
     """Return the base URL for API tests.
 
-    Priority: --base-url cli option > BASE_URL env var > default http://localhost:9000
+    Priority: fake server (--fake-sonarqube) > --base-url cli option > BASE_URL env var
+    > default http://localhost:9000
     """
+    if fake_sonarqube is not None:
+        return fake_sonarqube.base_url
     return (
         pytestconfig.getoption("--base-url")
         or os.environ.get("BASE_URL")
@@ -29,93 +238,219 @@ def base_url(pytestconfig):
 
 
 @pytest.fixture(scope="session")
-def auth():
+def basic_auth():
     """Provide an HTTPBasicAuth object for admin user when needed."""
     user = os.environ.get("API_USER", "admin")
     pwd = os.environ.get("API_PASS", "Mypassword1?")
     return HTTPBasicAuth(user, pwd)
 
 
-class ApiSessionWrapper:
-    """Wrap requests.Session to auto-attach requests/responses to Allure.
+@pytest.fixture(scope="session")
+def auth(pytestconfig, base_url, basic_auth, sonarqube_ready):
+    """Credential used by API tests: a session user token, falling back to Basic auth.
 
-    Usage in tests: pass the `api` fixture and call `api.get('/api/..')` — the
-    wrapper will preprend the base_url and attach the request+response JSON to Allure.
+    The token is generated once via /api/user_tokens/generate and revoked at session
+    end. Disabled with --no-token-auth or API_TOKEN_AUTH=false, and when replaying a
+    cassette (cassettes only record whether a call was authenticated).
     """
+    enabled = not pytestconfig.getoption("--no-token-auth") and (
+        os.environ.get("API_TOKEN_AUTH", "true").lower() != "false"
+    ) and not _replaying(pytestconfig)
+    if not enabled:
+        yield basic_auth
+        return
+    name = f"pytest-{worker_id()}-{RUN_ID}"
+    try:
+        token = generate_user_token(base_url, basic_auth, name)
+    except Exception as e:
+        warnings.warn(f"Could not generate a SonarQube user token ({e}); using Basic auth")
+        yield basic_auth
+        return
+    try:
+        yield token
+    finally:
+        revoke_user_token(base_url, basic_auth, name)
 
-    def __init__(self, base_url: str):
-        self._base = base_url.rstrip("/")
-        self._session = requests.Session()
-        self.last_response = None
-
-    def request(self, method, path, **kwargs):
-        url = path if path.startswith("http") else f"{self._base}{path if path.startswith('/') else '/' + path}"
-        resp = self._session.request(method, url, **kwargs)
-        self.last_response = resp
-        self._attach_response(method, url, kwargs, resp)
-        return resp
 
-    def get(self, path, **kwargs):
-        return self.request("GET", path, **kwargs)
+@pytest.fixture(scope="session", autouse=True)
+def sonarqube_ready(pytestconfig, base_url, basic_auth):
+    """Block the session until SonarQube reports UP and GREEN, polling with backoff.
 
-    def post(self, path, **kwargs):
-        return self.request("POST", path, **kwargs)
+    Startup timings are written to allure-results/sonarqube-startup.json and shown
+    in the terminal summary. Skipped with --skip-ready-check or when replaying a cassette.
+    """
+    if pytestconfig.getoption("--skip-ready-check") or _replaying(pytestconfig):
+        return None
+    timeout = pytestconfig.getoption("--ready-timeout") or float(
+        os.environ.get("READY_TIMEOUT", DEFAULT_READY_TIMEOUT)
+    )
+    metrics = wait_until_ready(base_url, auth=basic_auth, timeout=timeout)
+    record_startup(metrics, config=pytestconfig)
+    pytestconfig.sonarqube_startup = metrics
+    return metrics
 
-    def put(self, path, **kwargs):
-        return self.request("PUT", path, **kwargs)
 
-    def delete(self, path, **kwargs):
-        return self.request("DELETE", path, **kwargs)
+@pytest.fixture(scope="session", autouse=True)
+def health_sampler(pytestconfig, base_url, auth):
+    """Opt-in background health/latency timeline (--health-sample-interval).
 
-    def _attach_response(self, method, url, req_kwargs, resp):
+    At session end the timeline, with degraded samples correlated to the tests that
+    were running, is written to allure-results/health-timeline.json and attached
+    to Allure.
+    """
+    interval = pytestconfig.getoption("--health-sample-interval")
+    if not interval or _replaying(pytestconfig):
+        yield None
+        return
+    from API_Testing.health_sampler import HealthSampler
+
+    sampler = HealthSampler(
+        base_url, auth=auth, interval=interval, include_metrics=pytestconfig.getoption("--health-sample-metrics")
+    )
+    pytestconfig.health_sampler = sampler
+    sampler.start()
+    try:
+        yield sampler
+    finally:
+        sampler.stop()
+        pytestconfig.health_sampler = None
         try:
-            # Build a compact JSON-friendly object with request/response details
-            attach = {
-                "method": method,
-                "url": url,
-                "request_headers": {k: v for k, v in (req_kwargs.get("headers") or {}).items()},
-                "request_params": req_kwargs.get("params"),
-                "request_json": req_kwargs.get("json"),
-                "request_data": req_kwargs.get("data"),
-                "status_code": resp.status_code,
-            }
-            # Try to parse JSON response body, otherwise include text (trimmed)
-            try:
-                attach["response_body"] = resp.json()
-            except Exception:
-                attach["response_text"] = (resp.text[:10000] + "...") if len(resp.text) > 10000 else resp.text
-
-            allure.attach(
-                json.dumps(attach, default=str, indent=2),
-                name=f"{method} {url}",
-                attachment_type=allure.attachment_type.JSON,
-            )
+            body = write_json(per_worker_path(os.path.join("allure-results", "health-timeline.json"), pytestconfig), sampler.report())
+            allure.attach(body, name="health_timeline", attachment_type=allure.attachment_type.JSON)
         except Exception:
-            # best-effort; do not raise
             pass
 
 
+@pytest.fixture(scope="session")
+def api_client(base_url, pytestconfig):
+    """Session-wide ApiSessionWrapper shared by every API test.
+
+    One keep-alive connection pool serves the whole run instead of a new TCP
+    connection per call. Pool size and timeouts come from --api-pool-size /
+    --api-timeout, falling back to API_POOL_SIZE / API_CONNECT_TIMEOUT /
+    API_READ_TIMEOUT env vars. --api-capture/--api-capture-size pick when exchanges
+    are serialized to Allure, and --api-capture-bytes caps how much of each body
+    is read for reporting. --api-retries/--api-retry-budget tune the retry policy
+    that rides out transient 5xx and connection resets (see API_Testing/retry.py).
+    --cassette/--cassette-mode record the exchanges or replay them offline.
+    """
+    settings = client_settings_from_env()
+    for option, key in (
+        ("--api-capture", "capture"),
+        ("--api-capture-size", "capture_size"),
+        ("--api-capture-bytes", "capture_bytes"),
+    ):
+        value = pytestconfig.getoption(option)
+        if value:
+            settings[key] = value
+    pool_size = pytestconfig.getoption("--api-pool-size")
+    if pool_size:
+        settings["pool_maxsize"] = pool_size
+    timeout = pytestconfig.getoption("--api-timeout")
+    if timeout:
+        settings["timeout"] = (settings["timeout"][0], timeout)
+    settings["retry"] = pytestconfig.api_retry_policy = retry_policy_from_env(
+        pytestconfig.getoption("--api-retries"), pytestconfig.getoption("--api-retry-budget")
+    )
+
+    cassette_path = _cassette_path(pytestconfig)
+    if cassette_path:
+        settings["cassette"] = Cassette(cassette_path, _cassette_mode(pytestconfig), run_id=Common.naming.RUN_ID)
+
+    # cookies are not persisted so a login in one test cannot authenticate the next
+    client = ApiSessionWrapper(base_url, persist_cookies=False, **settings)
+    try:
+        yield client
+    finally:
+        _report_latency(pytestconfig, client)
+        client.close()
+        if client.cassette is not None:
+            client.cassette.close()
+
+
+# workeroutput key under which xdist workers hand their raw latency samples to the controller
+LATENCY_SAMPLES = "api_latency_samples"
+
+# the workers' samples, merged on the xdist controller
+_worker_latency = LatencyRecorder()
+
+
+def _report_latency(config, client):
+    """Write the session's per-endpoint latency percentiles to JSON and Allure.
+
+    Percentiles of different workers cannot be combined, so an xdist worker only
+    passes its raw samples on; the controller writes one summary for the run.
+    """
+    if hasattr(config, "workeroutput"):
+        config.workeroutput[LATENCY_SAMPLES] = client.latency.samples()
+        return
+    try:
+        body = write_json(per_worker_path(config.getoption("--latency-report"), config), client.latency.summary())
+        allure.attach(body, name="api_latency_percentiles", attachment_type=allure.attachment_type.JSON)
+    except Exception:
+        pass
+
+
 @pytest.fixture
-def api(base_url, request):
-    """Provide an ApiSessionWrapper for tests and expose the last response on the node.
+def api(api_client, request):
+    """Provide the shared ApiSessionWrapper and expose the last response on the node.
 
     Tests can use `api.get('/api/system/health', auth=auth)` or pass full URLs.
     """
-    session = ApiSessionWrapper(base_url)
-
+    api_client.last_response = None
+    api_client.reset_exchanges()
     # attach the wrapper to the test node so hooks can find last_response on failure
-    request.node.api_session = session
+    request.node.api_session = api_client
+    yield api_client
+    # failure attachments are made in pytest_runtest_makereport before teardown;
+    # drop the buffered responses now so their bodies are not kept alive
+    api_client.reset_exchanges()
+    api_client.close_streams()
+
+
+@pytest.fixture
+def async_api(api, pytestconfig):
+    """Provide an AsyncApiSessionWrapper over the shared client for concurrent calls."""
+    return AsyncApiSessionWrapper(api, concurrency=pytestconfig.getoption("--api-concurrency"))
+
+
+@pytest.fixture(scope="session")
+def project_factory(api_client, auth):
+    """Create uniquely-keyed projects; everything created is bulk-deleted at session end."""
+    factory = ProjectFactory(api_client, auth)
     try:
-        yield session
+        yield factory
     finally:
-        try:
-            session._session.close()
-        except Exception:
-            pass
+        factory.cleanup()
+
+
+@pytest.fixture(autouse=True)
+def _bind_unittest_api(request, base_url):
+    """Expose the shared clients on unittest.TestCase classes as `self.api`/`self.async_api`.
 
+    unittest classes cannot request fixtures directly, so the clients, the
+    `project_factory`, the session credential (`AUTH`) and the resolved base URL
+    are bound as class attributes before each test.
+    """
+    if request.cls is None or not issubclass(request.cls, unittest.TestCase):
+        yield
+        return
+    request.cls.api = request.getfixturevalue("api")
+    request.cls.async_api = request.getfixturevalue("async_api")
+    request.cls.project_factory = request.getfixturevalue("project_factory")
+    request.cls.BASE_URL = base_url
+    request.cls.AUTH = request.getfixturevalue("auth")
+    yield
 
 
 def pytest_configure(config):
+    config.addinivalue_line("markers", "load: load-generation test, only run with --load")
+    config.addinivalue_line("markers", "scaling: search scaling test, only run with --scaling")
+    if _replaying(config):
+        # generated project keys/names must match the recording, so reuse its run id
+        run_id = read_header(_cassette_path(config)).get("run_id")
+        if run_id:
+            Common.naming.RUN_ID = run_id
     # write environment.properties for Allure
     try:
         os.makedirs("allure-results", exist_ok=True)
@@ -148,6 +483,27 @@ def pytest_configure(config):
 
 
 
+def pytest_collection_modifyitems(config, items):
+    # expensive opt-in tests: marker -> enabling option
+    for marker, option in (("load", "--load"), ("scaling", "--scaling")):
+        if config.getoption(option):
+            continue
+        skip = pytest.mark.skip(reason=f"{marker} test: run with {option}")
+        for item in items:
+            if item.get_closest_marker(marker):
+                item.add_marker(skip)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    """Report each test's span to the background health sampler (if running)."""
+    started = time.monotonic()
+    yield
+    sampler = getattr(item.config, "health_sampler", None)
+    if sampler:
+        sampler.add_test_span(item.nodeid, started, time.monotonic())
+
+
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_call(item):
     """Add dynamic Allure parameters from environment before each test runs."""
@@ -177,7 +533,10 @@ def pytest_runtest_makereport(item, call):
         # Attach the last API response (if any) to Allure for debugging
         try:
             session = getattr(item, "api_session", None) or getattr(item.node, "api_session", None)
-            if session and getattr(session, "last_response", None):
+            if session and getattr(session, "capture", None) == CAPTURE_ON_FAILURE:
+                # the buffered exchanges already include the last response
+                session.attach_exchanges()
+            elif session and getattr(session, "last_response", None):
                 resp = session.last_response
                 try:
                     body = None
@@ -192,3 +551,29 @@ def pytest_runtest_makereport(item, call):
                     pass
         except Exception:
             pass
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """xdist controller: collect the latency samples of a finished worker."""
+    samples = getattr(node, "workeroutput", {}).get(LATENCY_SAMPLES)
+    if samples:
+        _worker_latency.merge(samples)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if worker_id() == "main" and _worker_latency.samples():
+        write_json(per_worker_path(session.config.getoption("--latency-report"), session.config), _worker_latency.summary())
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    metrics = getattr(config, "sonarqube_startup", None)
+    if metrics:
+        terminalreporter.write_line(
+            f"SonarQube ready (GREEN) after {metrics['green_after_s']}s, {metrics['attempts']} polls"
+        )
+    policy = getattr(config, "api_retry_policy", None)
+    if policy and (policy.retried or policy.circuit_opens):
+        terminalreporter.write_line(
+            f"API retries: {policy.retried} (budget left {policy.budget}), circuit breaker opened {policy.circuit_opens}x"
+        )
@@ -0,0 +1,416 @@
+import os
+import sys
+import json
+import base64
+import secrets
+import threading
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+SESSION_COOKIE = "JWT-SESSION"
+XSRF_COOKIE = "XSRF-TOKEN"
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+class FakeSonarQube:
+    """In-process stand-in for the SonarQube Web API endpoints this suite exercises.
+
+    It mirrors the status codes the tests assert (403 on unauthenticated health,
+    404 on unknown project keys, 204 on delete/update, ...) and keeps its state in
+    memory, so API tests run offline in milliseconds:
+
+        server = FakeSonarQube().start()
+        server.base_url  # -> http://127.0.0.1:<port>
+        server.stop()
+
+    Only admin credentials are known (API_USER / API_PASS env vars, defaulting to
+    the same values the tests use).
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, users=None):
+        self.users = users or {
+            os.environ.get("API_USER", "admin"): os.environ.get("API_PASS", "Mypassword1?")
+        }
+        self.projects = {}
+        self._search_cache = {}
+        self.sessions = {}
+        self.tokens = {}
+        self._fault = None
+        self.lock = threading.Lock()
+        self._httpd = _Server((host, port), _Handler)
+        self._httpd.app = self
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        # a short poll interval keeps stop() from blocking the session teardown
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, args=(0.05,), name="fake-sonarqube", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    # ---------- fault injection ----------
+    def inject_faults(self, count, status=503, reset=False, retry_after=None, path=None):
+        """Fail the next `count` requests (only those to `path`, when given).
+
+        Each gets `status` (with a Retry-After header if `retry_after` is set), or with
+        `reset` the connection is closed without a response, like a restarting proxy.
+        `inject_faults(0)` clears any faults left.
+        """
+        with self.lock:
+            self._fault = {"count": count, "status": status, "reset": reset, "retry_after": retry_after, "path": path}
+
+    def faults_left(self):
+        with self.lock:
+            return self._fault["count"] if self._fault else 0
+
+    def take_fault(self, path):
+        """The fault to apply to a request for `path`, or None (uses up one of `count`)."""
+        with self.lock:
+            fault = self._fault
+            if not fault or fault["count"] <= 0 or (fault["path"] and fault["path"] != path):
+                return None
+            fault["count"] -= 1
+            return dict(fault)
+
+    # ---------- projects ----------
+    def projects_changed(self):
+        """Invalidate cached search results; call with the lock held after any project mutation."""
+        self._search_cache.clear()
+
+    def matching_project_keys(self, query):
+        """Sorted keys matching `query` (lock held), cached so paging through results stays linear."""
+        keys = self._search_cache.get(query)
+        if keys is None:
+            keys = sorted(self.projects)
+            if query:
+                keys = [k for k in keys if query in k.lower() or query in self.projects[k]["name"].lower()]
+            self._search_cache[query] = keys
+        return keys
+
+    # ---------- authentication ----------
+    def check_password(self, login, password):
+        return login in self.users and self.users[login] == password
+
+    def open_session(self, login):
+        token = secrets.token_urlsafe(24)
+        with self.lock:
+            self.sessions[token] = login
+        return token
+
+    def close_session(self, token):
+        with self.lock:
+            self.sessions.pop(token, None)
+
+    def token_user(self, token):
+        for (login, _), value in list(self.tokens.items()):
+            if value == token:
+                return login
+        return None
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # clients may drop a keep-alive socket mid-body (e.g. unread streamed
+        # responses being closed); that is not worth a traceback on stderr
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+def _error(msg):
+    return {"errors": [{"msg": msg}]}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "FakeSonarQube"
+    # headers and body are written separately; without TCP_NODELAY every
+    # keep-alive response would stall on the client's delayed ACK (~40ms)
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        # keep pytest output clean
+        pass
+
+    @property
+    def app(self) -> FakeSonarQube:
+        return self.server.app
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    # ---------- plumbing ----------
+    def _dispatch(self, method):
+        parts = urlsplit(self.path)
+        self.params = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        if body and "application/x-www-form-urlencoded" in (self.headers.get("Content-Type") or ""):
+            self.params.update({k: v[-1] for k, v in parse_qs(body.decode("utf-8")).items()})
+        self.set_cookies = []
+        self.extra_headers = []
+
+        fault = self.app.take_fault(parts.path)
+        if fault is not None:
+            if fault["reset"]:
+                # drop the connection without writing a response
+                self.close_connection = True
+                return
+            if fault["retry_after"] is not None:
+                self.extra_headers.append(("Retry-After", str(fault["retry_after"])))
+            return self._send(fault["status"], _error("Injected fault"))
+
+        route = _ROUTES.get((method, parts.path))
+        if route is None:
+            if any(path == parts.path for _, path in _ROUTES):
+                return self._send(405, _error(f"HTTP method {method} is not supported"))
+            return self._send(404, _error(f"Unknown url : {parts.path}"))
+        try:
+            status, payload = route(self)
+        except Exception as e:  # pragma: no cover - surfaced as a 500 like the real server
+            status, payload = 500, _error(str(e))
+        self._send(status, payload)
+
+    def _send(self, status, payload=None):
+        body = b"" if payload is None or status == 204 else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        if body:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for cookie in self.set_cookies:
+            self.send_header("Set-Cookie", cookie)
+        for name, value in self.extra_headers:
+            self.send_header(name, value)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def _cookies(self):
+        jar = SimpleCookie()
+        try:
+            jar.load(self.headers.get("Cookie") or "")
+        except Exception:
+            pass
+        return {k: m.value for k, m in jar.items()}
+
+    def _basic_credentials(self):
+        header = self.headers.get("Authorization") or ""
+        if not header.startswith("Basic "):
+            return None
+        try:
+            login, _, password = base64.b64decode(header[6:]).decode("utf-8").partition(":")
+        except Exception:
+            return None
+        return login, password
+
+    def _user(self):
+        """Resolve the caller: 'anonymous' (None), a login, or False for bad credentials."""
+        header = self.headers.get("Authorization") or ""
+        if header.startswith("Bearer "):
+            return self.app.token_user(header[7:]) or False
+        creds = self._basic_credentials()
+        if creds is not None:
+            if self.app.check_password(*creds):
+                return creds[0]
+            # legacy form: the token as Basic username with an empty password
+            return (not creds[1] and self.app.token_user(creds[0])) or False
+        token = self._cookies().get(SESSION_COOKIE)
+        if token:
+            return self.app.sessions.get(token)
+        return None
+
+    def _require_user(self):
+        user = self._user()
+        if user is False:
+            return None, (401, None)
+        if user is None:
+            return None, (401, _error("Authentication is required"))
+        return user, None
+
+    # ---------- /api/system ----------
+    def system_status(self):
+        return 200, {"id": "fake-sonarqube", "version": "25.7.0.110598", "status": "UP"}
+
+    def system_health(self):
+        user = self._user()
+        if user is False:
+            return 401, None
+        if user is None:
+            return 403, _error("Insufficient privileges")
+        return 200, {"health": "GREEN", "causes": []}
+
+    # ---------- /api/authentication ----------
+    def login(self):
+        login, password = self.params.get("login"), self.params.get("password")
+        if login is None and password is None:
+            creds = self._basic_credentials()
+            if creds:
+                login, password = creds
+        if login is None or not self.app.check_password(login, password):
+            return 401, None
+        token = self.app.open_session(login)
+        self.set_cookies.append(f"{SESSION_COOKIE}={token}; Path=/; HttpOnly")
+        self.set_cookies.append(f"{XSRF_COOKIE}={secrets.token_urlsafe(16)}; Path=/")
+        return 200, None
+
+    def logout(self):
+        token = self._cookies().get(SESSION_COOKIE)
+        if token:
+            self.app.close_session(token)
+        for name in (SESSION_COOKIE, XSRF_COOKIE):
+            self.set_cookies.append(f"{name}=; Path=/; Max-Age=0")
+        return 200, None
+
+    # ---------- /api/user_tokens ----------
+    def user_tokens_generate(self):
+        user, denied = self._require_user()
+        if denied:
+            return denied
+        name = self.params.get("name")
+        if not name:
+            return 400, _error("The 'name' parameter is missing")
+        with self.app.lock:
+            if (user, name) in self.app.tokens:
+                return 400, _error(f"A user token for login '{user}' and name '{name}' already exists")
+            token = "squ_" + secrets.token_hex(20)
+            self.app.tokens[(user, name)] = token
+        return 200, {"login": user, "name": name, "token": token, "type": "USER_TOKEN"}
+
+    def user_tokens_revoke(self):
+        user, denied = self._require_user()
+        if denied:
+            return denied
+        with self.app.lock:
+            self.app.tokens.pop((user, self.params.get("name")), None)
+        return 204, None
+
+    # ---------- /api/projects ----------
+    def projects_create(self):
+        _, denied = self._require_user()
+        if denied:
+            return denied
+        name, key = self.params.get("name"), self.params.get("project")
+        if not name or not key:
+            return 400, _error("The 'name' and 'project' parameters are missing")
+        with self.app.lock:
+            if key in self.app.projects:
+                return 400, _error(f'Could not create Project with key: "{key}". A similar key already exists: "{key}"')
+            project = {
+                "key": key,
+                "name": name,
+                "qualifier": "TRK",
+                "visibility": self.params.get("visibility", "public"),
+            }
+            self.app.projects[key] = project
+            self.app.projects_changed()
+        return 200, {"project": dict(project)}
+
+    def projects_delete(self):
+        _, denied = self._require_user()
+        if denied:
+            return denied
+        key = self.params.get("project")
+        with self.app.lock:
+            if key not in self.app.projects:
+                return 404, _error(f"Project '{key}' not found")
+            del self.app.projects[key]
+            self.app.projects_changed()
+        return 204, None
+
+    def projects_bulk_delete(self):
+        _, denied = self._require_user()
+        if denied:
+            return denied
+        keys = [k for k in (self.params.get("projects") or "").split(",") if k]
+        if not keys and not self.params.get("q"):
+            return 400, _error("At least one parameter among analyzedBefore, projects and q must be provided")
+        query = (self.params.get("q") or "").lower()
+        with self.app.lock:
+            for key in list(self.app.projects):
+                if (keys and key in keys) or (not keys and query in key.lower()):
+                    del self.app.projects[key]
+            self.app.projects_changed()
+        return 204, None
+
+    def projects_search(self):
+        _, denied = self._require_user()
+        if denied:
+            return denied
+        try:
+            page = max(int(self.params.get("p", 1)), 1)
+            size = int(self.params.get("ps", DEFAULT_PAGE_SIZE))
+        except ValueError:
+            return 400, _error("'p' and 'ps' must be integers")
+        if size > MAX_PAGE_SIZE:
+            return 400, _error(f"'ps' value ({size}) must be less than {MAX_PAGE_SIZE + 1}")
+        query = (self.params.get("q") or "").lower()
+        start = (page - 1) * size
+        with self.app.lock:
+            keys = self.app.matching_project_keys(query)
+            components = [dict(self.app.projects[k]) for k in keys[start:start + size]]
+        return 200, {
+            "paging": {"pageIndex": page, "pageSize": size, "total": len(keys)},
+            "components": components,
+        }
+
+    def projects_update_key(self):
+        _, denied = self._require_user()
+        if denied:
+            return denied
+        old, new = self.params.get("from"), self.params.get("to")
+        with self.app.lock:
+            if old not in self.app.projects:
+                return 404, _error(f"Project '{old}' not found")
+            if new in self.app.projects:
+                return 400, _error(f"Impossible to update key: a component with key \"{new}\" already exists.")
+            project = self.app.projects.pop(old)
+            project["key"] = new
+            self.app.projects[new] = project
+            self.app.projects_changed()
+        return 204, None
+
+    def projects_update_visibility(self):
+        _, denied = self._require_user()
+        if denied:
+            return denied
+        key, visibility = self.params.get("project"), self.params.get("visibility")
+        if visibility not in ("public", "private"):
+            return 400, _error(f"Value of parameter 'visibility' ({visibility}) must be one of: [private, public]")
+        with self.app.lock:
+            if key not in self.app.projects:
+                return 404, _error(f"Project '{key}' not found")
+            self.app.projects[key]["visibility"] = visibility
+        return 204, None
+
+
+_ROUTES = {
+    ("GET", "/api/system/status"): _Handler.system_status,
+    ("GET", "/api/system/health"): _Handler.system_health,
+    ("POST", "/api/authentication/login"): _Handler.login,
+    ("POST", "/api/authentication/logout"): _Handler.logout,
+    ("POST", "/api/user_tokens/generate"): _Handler.user_tokens_generate,
+    ("POST", "/api/user_tokens/revoke"): _Handler.user_tokens_revoke,
+    ("POST", "/api/projects/create"): _Handler.projects_create,
+    ("POST", "/api/projects/delete"): _Handler.projects_delete,
+    ("POST", "/api/projects/bulk_delete"): _Handler.projects_bulk_delete,
+    ("GET", "/api/projects/search"): _Handler.projects_search,
+    ("POST", "/api/projects/update_key"): _Handler.projects_update_key,
+    ("POST", "/api/projects/update_visibility"): _Handler.projects_update_visibility,
+}
@@ -0,0 +1,105 @@
+import time
+import threading
+import statistics
+import requests
+
+from Common.stats import summarize
+
+
+SLOW_FACTOR = 3.0
+
+
+class HealthSampler(threading.Thread):
+    """Daemon thread that samples /api/system/health while the suite runs.
+
+    Every `interval` seconds it records latency, HTTP status and reported health
+    (optionally also timing /api/monitoring/metrics) on a timeline relative to the
+    sampler start. The pytest hooks report each test's span through `add_test_span`,
+    so `report()` can list the tests that were running whenever a sample was
+    degraded: not GREEN, an error, or slower than SLOW_FACTOR x the median sample.
+    """
+
+    def __init__(self, base_url, auth=None, interval=5.0, include_metrics=False):
+        super().__init__(name="health-sampler", daemon=True)
+        self._base = base_url.rstrip("/")
+        self._auth = auth
+        self._interval = interval
+        self._include_metrics = include_metrics
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._origin = time.monotonic()
+        self.samples = []
+        self.test_spans = []
+
+    def _now(self):
+        return round(time.monotonic() - self._origin, 3)
+
+    def add_test_span(self, nodeid, started, finished):
+        """Record a test's run time; `started`/`finished` are time.monotonic() values."""
+        with self._lock:
+            self.test_spans.append({
+                "nodeid": nodeid,
+                "start": round(started - self._origin, 3),
+                "end": round(finished - self._origin, 3),
+            })
+
+    # ---------- sampling ----------
+    def run(self):
+        with requests.Session() as http:
+            while not self._stop_event.is_set():
+                self.samples.append(self._sample(http))
+                self._stop_event.wait(self._interval)
+
+    def _timed_get(self, http, path):
+        started = time.perf_counter()
+        try:
+            resp = http.get(f"{self._base}{path}", auth=self._auth, timeout=max(self._interval, 5))
+            return resp, round((time.perf_counter() - started) * 1000, 2), None
+        except requests.RequestException as e:
+            return None, round((time.perf_counter() - started) * 1000, 2), type(e).__name__
+
+    def _sample(self, http):
+        sample = {"t": self._now()}
+        resp, sample["latency_ms"], sample["error"] = self._timed_get(http, "/api/system/health")
+        sample["status"] = resp.status_code if resp is not None else None
+        try:
+            sample["health"] = resp.json().get("health") if resp is not None and resp.ok else None
+        except ValueError:
+            sample["health"] = None
+        if self._include_metrics:
+            resp, sample["metrics_latency_ms"], _ = self._timed_get(http, "/api/monitoring/metrics")
+            sample["metrics_status"] = resp.status_code if resp is not None else None
+        return sample
+
+    def stop(self, timeout=10):
+        self._stop_event.set()
+        self.join(timeout)
+
+    # ---------- reporting ----------
+    def _running_at(self, t):
+        with self._lock:
+            spans = list(self.test_spans)
+        return sorted({s["nodeid"] for s in spans if s["start"] <= t <= s["end"]})
+
+    def report(self):
+        samples = list(self.samples)
+        latencies = [s["latency_ms"] for s in samples if s["error"] is None]
+        median = statistics.median(latencies) if latencies else None
+        degraded = []
+        for s in samples:
+            reasons = []
+            if s["error"]:
+                reasons.append(s["error"])
+            elif s["health"] != "GREEN":
+                reasons.append(f"health={s['health']} (HTTP {s['status']})")
+            if median and s["latency_ms"] > SLOW_FACTOR * median:
+                reasons.append(f"slow ({s['latency_ms']}ms vs median {median}ms)")
+            if reasons:
+                degraded.append({"t": s["t"], "reasons": reasons, "running_tests": self._running_at(s["t"])})
+        return {
+            "interval_s": self._interval,
+            "latency_ms": summarize(latencies),
+            "degraded": degraded,
+            "samples": samples,
+            "tests": self.test_spans,
+        }
@@ -0,0 +1,123 @@
+import re
+import copy
+import threading
+import time
+from urllib.parse import urlsplit
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from requests.adapters import HTTPAdapter
+
+from Common.stats import summarize
+
+
+# connect() runs on the calling thread, so a thread-local hands its duration to
+# the request that triggered it (also works for the async wrapper's worker threads)
+_connect_timing = threading.local()
+
+
+class _TimedConnectMixin:
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _connect_timing.seconds = getattr(_connect_timing, "seconds", 0.0) + time.perf_counter() - started
+
+
+class _TimedHTTPConnection(_TimedConnectMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimingHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections record how long DNS + TCP (+ TLS) connect took."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+def reset_connect_timing():
+    _connect_timing.seconds = 0.0
+
+
+def take_connect_timing():
+    """Connect time spent on this thread since the last reset (0.0 for a reused socket)."""
+    seconds = getattr(_connect_timing, "seconds", 0.0)
+    _connect_timing.seconds = 0.0
+    return seconds
+
+
+_NUMERIC_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def path_template(url):
+    """Group calls by path: query strings dropped, numeric ids replaced by {id}."""
+    return _NUMERIC_SEGMENT.sub("/{id}", urlsplit(url).path) or "/"
+
+
+class LatencyRecorder:
+    """Thread-safe per-endpoint latency samples, keyed like 'POST /api/projects/create'.
+
+    Each sample splits the call into:
+    - connect: DNS + TCP (+ TLS) time; 0 when a kept-alive socket was reused.
+    - server: time from sending the request to parsed response headers, minus connect.
+    - total: wall time of the whole call, including reading the body.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = {}
+
+    def record(self, method, url, status_code, total, elapsed=None, connect=0.0):
+        server = max((elapsed if elapsed is not None else total) - connect, 0.0)
+        key = f"{method} {path_template(url)}"
+        with self._lock:
+            entry = self._samples.setdefault(key, {"total": [], "server": [], "connect": [], "statuses": {}})
+            entry["total"].append(total)
+            entry["server"].append(server)
+            entry["connect"].append(connect)
+            entry["statuses"][str(status_code)] = entry["statuses"].get(str(status_code), 0) + 1
+
+    def samples(self):
+        """A copy of the raw samples; plain JSON types, so it can cross to the xdist controller."""
+        with self._lock:
+            return copy.deepcopy(self._samples)
+
+    def merge(self, samples):
+        """Add raw samples taken by another recorder (see `samples`)."""
+        with self._lock:
+            for key, other in samples.items():
+                entry = self._samples.setdefault(key, {"total": [], "server": [], "connect": [], "statuses": {}})
+                for field in ("total", "server", "connect"):
+                    entry[field].extend(other[field])
+                for status, count in other["statuses"].items():
+                    entry["statuses"][status] = entry["statuses"].get(status, 0) + count
+
+    def summary(self):
+        """Per-endpoint counts and p50/p95/p99 (milliseconds), slowest p95 first."""
+        report = {}
+        for key, entry in self.samples().items():
+            report[key] = {
+                "count": len(entry["total"]),
+                "statuses": entry["statuses"],
+                "total_ms": summarize(entry["total"], scale=1000),
+                "server_ms": summarize(entry["server"], scale=1000),
+                "connect_ms": summarize(entry["connect"], scale=1000),
+                "new_connections": sum(1 for c in entry["connect"] if c > 0),
+            }
+        return dict(sorted(report.items(), key=lambda kv: kv[1]["total_ms"]["p95"], reverse=True))
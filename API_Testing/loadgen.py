@@ -0,0 +1,149 @@
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from API_Testing.client import CAPTURE_OFF, ApiSessionWrapper
+from Common.stats import summarize
+
+
+DEFAULT_MIX = "search=6,health=3,login=1"
+
+
+def _search(api, auth, credentials):
+    return api.get("/api/projects/search", params={"ps": 50}, auth=auth)
+
+
+def _health(api, auth, credentials):
+    return api.get("/api/system/health", auth=auth)
+
+
+def _login(api, auth, credentials):
+    return api.post("/api/authentication/login", data={"login": credentials[0], "password": credentials[1]})
+
+
+SCENARIOS = {
+    "search": _search,
+    "health": _health,
+    "login": _login,
+}
+
+
+def parse_mix(spec):
+    """Parse 'search=6,health=3,login=1' into {'search': 6.0, ...} (weights, not percentages)."""
+    mix = {}
+    for part in (spec or DEFAULT_MIX).split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown load scenario '{name}' (known: {', '.join(SCENARIOS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class LoadResult:
+    """Thread-safe tally of load-run outcomes per scenario."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+        self.elapsed = 0.0
+
+    def record(self, scenario, seconds, ok):
+        with self._lock:
+            self.latencies.setdefault(scenario, []).append(seconds)
+            if not ok:
+                self.errors[scenario] = self.errors.get(scenario, 0) + 1
+
+    @property
+    def requests(self):
+        return sum(len(v) for v in self.latencies.values())
+
+    @property
+    def error_rate(self):
+        return (sum(self.errors.values()) / self.requests) if self.requests else 0.0
+
+    def summary(self):
+        everything = [s for v in self.latencies.values() for s in v]
+        return {
+            "duration_s": round(self.elapsed, 3),
+            "requests": self.requests,
+            "throughput_rps": round(self.requests / self.elapsed, 2) if self.elapsed else 0.0,
+            "error_rate": round(self.error_rate, 4),
+            "latency_ms": summarize(everything, scale=1000),
+            "scenarios": {
+                name: {
+                    "errors": self.errors.get(name, 0),
+                    "latency_ms": summarize(values, scale=1000),
+                }
+                for name, values in sorted(self.latencies.items())
+            },
+        }
+
+
+class _Pacer:
+    """Hands out evenly spaced start times so all workers together hit `rate` req/s."""
+
+    def __init__(self, rate, start):
+        self._interval = 1.0 / rate
+        self._next = start
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            slot = self._next
+            self._next += self._interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def run_load(base_url, auth, credentials, mix=None, duration=10.0, concurrency=8, rate=None, seed=None):
+    """Drive a weighted mix of SonarQube calls for `duration` seconds.
+
+    `concurrency` worker threads share one keep-alive pool sized to match. Without
+    `rate` every worker sends back-to-back (closed loop, measures capacity); with
+    `rate` the workers are paced to that many requests per second overall (open loop,
+    measures latency at a given load). Exchanges are not attached to Allure.
+    """
+    mix = mix or parse_mix(DEFAULT_MIX)
+    names, weights = list(mix), list(mix.values())
+    api = ApiSessionWrapper(base_url, pool_maxsize=concurrency, persist_cookies=False, capture=CAPTURE_OFF)
+    result = LoadResult()
+    started = time.monotonic()
+    deadline = started + duration
+    pacer = _Pacer(rate, started) if rate else None
+
+    def worker(index):
+        rng = random.Random(None if seed is None else seed + index)
+        while time.monotonic() < deadline:
+            if pacer:
+                pacer.wait()
+                if time.monotonic() >= deadline:
+                    break
+            name = rng.choices(names, weights)[0]
+            t0 = time.perf_counter()
+            try:
+                ok = SCENARIOS[name](api, auth, credentials).status_code < 400
+            except Exception:
+                ok = False
+            result.record(name, time.perf_counter() - t0, ok)
+
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="loadgen") as pool:
+            list(pool.map(worker, range(concurrency)))
+    finally:
+        result.elapsed = time.monotonic() - started
+        api.close()
+    return result
+
+
+def slo_violations(summary, p95_ms=None, error_rate=None):
+    """Return human-readable SLO breaches (empty list when the run is within SLO)."""
+    breaches = []
+    observed_p95 = summary["latency_ms"].get("p95")
+    if p95_ms is not None and observed_p95 is not None and observed_p95 > p95_ms:
+        breaches.append(f"p95 latency {observed_p95}ms > {p95_ms}ms")
+    if error_rate is not None and summary["error_rate"] > error_rate:
+        breaches.append(f"error rate {summary['error_rate']:.2%} > {error_rate:.2%}")
+    return breaches
@@ -0,0 +1,127 @@
+import os
+import time
+import random
+import threading
+import requests
+
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUSES = frozenset({502, 503, 504})
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised without calling the server while the circuit breaker is open."""
+
+
+class RetryPolicy:
+    """Retry transient failures of idempotent calls, with a budget and a circuit breaker.
+
+    - Only `methods` are retried (POST is never replayed), on `statuses` or on
+      connection errors/timeouts, up to `max_retries` times per call.
+    - Delays back off exponentially (`backoff` * 2^attempt, capped at `max_backoff`,
+      with full jitter); a Retry-After header on the response takes precedence.
+    - `budget` caps retries across the whole session so a dead server cannot
+      multiply the run time.
+    - After `breaker_threshold` consecutive calls that still failed (after their
+      retries), the breaker opens: calls fail fast with CircuitOpenError for
+      `breaker_cooldown` seconds, then a single trial call is let through (the
+      others keep failing fast until it completes). Its success closes the
+      breaker; its failure opens it for another cooldown.
+
+    `before_call()` and `record_outcome()` bracket each logical call (retries
+    included), so every call that got through must report its outcome.
+
+    Shared by every thread using the client, hence the lock.
+    """
+
+    def __init__(
+        self,
+        max_retries=2,
+        statuses=RETRY_STATUSES,
+        methods=IDEMPOTENT_METHODS,
+        backoff=0.5,
+        max_backoff=8.0,
+        budget=20,
+        breaker_threshold=5,
+        breaker_cooldown=30.0,
+        sleep=time.sleep,
+    ):
+        self.max_retries = max_retries
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(m.upper() for m in methods)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.budget = budget
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self._consecutive_failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self.retried = 0
+        self.circuit_opens = 0
+
+    # ---------- circuit breaker ----------
+    def before_call(self):
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if self._trial_in_flight or time.monotonic() - self._opened_at < self.breaker_cooldown:
+                raise CircuitOpenError(
+                    f"circuit open after {self._consecutive_failures} consecutive failures; "
+                    f"failing fast for {self.breaker_cooldown:.0f}s"
+                )
+            # half-open: this call is the trial, everyone else keeps failing fast
+            self._trial_in_flight = True
+
+    def record_outcome(self, failed):
+        with self._lock:
+            trial, self._trial_in_flight = self._trial_in_flight, False
+            if not failed:
+                self._consecutive_failures = 0
+                self._opened_at = None
+                return
+            self._consecutive_failures += 1
+            if trial or (self._consecutive_failures >= self.breaker_threshold and self._opened_at is None):
+                # a failed trial re-opens the breaker for another cooldown
+                self._opened_at = time.monotonic()
+                self.circuit_opens += 1
+
+    # ---------- retries ----------
+    def is_transient(self, status=None, error=None):
+        if error is not None:
+            return isinstance(error, (requests.ConnectionError, requests.Timeout)) and not isinstance(
+                error, CircuitOpenError
+            )
+        return status in self.statuses
+
+    def next_delay(self, method, attempt, resp=None):
+        """Delay before retry number `attempt` (0-based), or None if no retry is allowed."""
+        if method.upper() not in self.methods or attempt >= self.max_retries:
+            return None
+        with self._lock:
+            if self.budget <= 0:
+                return None
+            self.budget -= 1
+            self.retried += 1
+        retry_after = resp.headers.get("Retry-After") if resp is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_backoff)
+        return min(self.max_backoff, self.backoff * (2 ** attempt)) * random.random()
+
+
+def retry_policy_from_env(max_retries=None, budget=None):
+    """RetryPolicy for the shared client; API_RETRIES / API_RETRY_BUDGET override the defaults.
+
+    Explicit (non-None) arguments, e.g. from CLI options, win over the environment.
+    """
+    settings = {}
+    for key, env, value in (("max_retries", "API_RETRIES", max_retries), ("budget", "API_RETRY_BUDGET", budget)):
+        if value is None:
+            try:
+                value = int(os.environ[env])
+            except (KeyError, ValueError):
+                continue
+        settings[key] = value
+    return RetryPolicy(**settings)
@@ -0,0 +1,34 @@
+import pytest
+
+from API_Testing import client as client_module
+from API_Testing.client import ApiSessionWrapper, StreamEvictedError
+
+
+SEARCH = "/api/projects/search"
+
+
+@pytest.fixture
+def streaming_client(fake_sonarqube):
+    """A client that streams bodies past a 10-byte prefix and holds at most 2 of them open."""
+    if fake_sonarqube is None:
+        pytest.skip("needs the in-process server (--fake-sonarqube)")
+    client = ApiSessionWrapper(fake_sonarqube.base_url, capture_bytes=10, pool_maxsize=2)
+    yield client
+    client.close()
+
+
+def test_small_evicted_body_is_still_readable(streaming_client, basic_auth):
+    responses = [streaming_client.get(SEARCH, auth=basic_auth) for _ in range(3)]
+
+    # the first one was evicted when the third arrived: read in full, not cut at the prefix
+    assert responses[0]._content_consumed
+    assert [r.json()["paging"]["pageIndex"] for r in responses] == [1, 1, 1]
+
+
+def test_large_evicted_body_cannot_be_read(streaming_client, basic_auth, monkeypatch):
+    monkeypatch.setattr(client_module, "DRAIN_MAX_BYTES", 0)
+    responses = [streaming_client.get(SEARCH, auth=basic_auth) for _ in range(3)]
+
+    with pytest.raises(StreamEvictedError, match="discarded unread"):
+        responses[0].json()
+    assert responses[1].json()["paging"]["pageIndex"] == 1
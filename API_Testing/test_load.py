@@ -0,0 +1,35 @@
+import os
+import allure
+import pytest
+
+from API_Testing.loadgen import parse_mix, run_load, slo_violations
+from Common.reporting import per_worker_path, write_json
+
+
+@pytest.mark.load
+def test_api_load(base_url, auth, pytestconfig):
+    """Drive the configured request mix and enforce the optional SLOs.
+
+    Only runs with --load, e.g.:
+    pytest API_Testing/test_load.py --load --load-duration 60 --load-concurrency 16 --slo-p95-ms 500
+    """
+    result = run_load(
+        base_url,
+        auth,
+        (os.environ.get("API_USER", "admin"), os.environ.get("API_PASS", "Mypassword1?")),
+        mix=parse_mix(pytestconfig.getoption("--load-mix")),
+        duration=pytestconfig.getoption("--load-duration"),
+        concurrency=pytestconfig.getoption("--load-concurrency"),
+        rate=pytestconfig.getoption("--load-rate"),
+    )
+    summary = result.summary()
+    body = write_json(per_worker_path(os.path.join("allure-results", "load-report.json"), pytestconfig), summary)
+    allure.attach(body, name="load_report", attachment_type=allure.attachment_type.JSON)
+
+    assert result.requests > 0, "load run issued no requests"
+    breaches = slo_violations(
+        summary,
+        p95_ms=pytestconfig.getoption("--slo-p95-ms"),
+        error_rate=pytestconfig.getoption("--slo-error-rate"),
+    )
+    assert not breaches, "SLO breached: " + "; ".join(breaches)
@@ -1,68 +1,74 @@
 import os
+import asyncio
 import unittest
-import requests
 from requests.auth import HTTPBasicAuth
+from API_Testing.projects import iter_projects
+from Common.naming import unique_key, unique_name
 
 class TestProjects(unittest.TestCase):
     BASE_URL = os.environ.get("BASE_URL", "http://localhost:9000")
     AUTH = HTTPBasicAuth("admin", "Mypassword1?")
-    PROJECT_NAME = "MyProject"
-    PROJECT_KEY = "my_project"
+    BULK_COUNT = 20
+    api = None  # shared ApiSessionWrapper, bound by the conftest
+    async_api = None  # AsyncApiSessionWrapper over the same pool, bound by the conftest
+    project_factory = None  # session ProjectFactory, bound by the conftest
 
     def setUp(self):
-        """Ensure a clean start by deleting the project if it exists."""
-        self.delete_project(self.PROJECT_KEY)
-
-    def tearDown(self):
-        """Clean up after each test."""
-        self.delete_project(self.PROJECT_KEY)
-        self.delete_project("newKey")  # cleanup from update_key tests
+        """Give each test fresh keys; the project factory bulk-deletes leftovers at session end."""
+        # namespaced per worker/run so parallel workers never touch each other's projects
+        self.project_name = unique_name("MyProject")
+        self.project_key = unique_key("my_project")
+        self.new_key = unique_key("newKey")
 
     # ---------- Helper Methods ----------
     def create_project(self, name=None, key=None):
         """Create a project in SonarQube."""
-        data = {
-            "name": name or self.PROJECT_NAME,
-            "project": key or self.PROJECT_KEY
-        }
-        return requests.post(f"{self.BASE_URL}/api/projects/create", data=data, auth=self.AUTH)
+        return self.project_factory.create(name=name or self.project_name, key=key or self.project_key)
 
     def delete_project(self, key):
         """Delete a project from SonarQube."""
-        return requests.post(f"{self.BASE_URL}/api/projects/delete", data={"project": key}, auth=self.AUTH)
+        res = self.api.post("/api/projects/delete", data={"project": key}, auth=self.AUTH)
+        if res.status_code == 204:
+            self.project_factory.forget(key)
+        return res
 
     def search_projects(self):
-        """Search all projects."""
-        return requests.get(f"{self.BASE_URL}/api/projects/search", auth=self.AUTH)
+        """Search all projects (first page only)."""
+        return self.api.get("/api/projects/search", auth=self.AUTH)
+
+    def project_listed(self, key, name):
+        """Whether the search lists a project with this key and name (filtered by key, stops at the first match)."""
+        return any(p["key"] == key and p["name"] == name for p in iter_projects(self.api, self.AUTH, q=key))
 
     def update_key(self, old_key, new_key):
         """Update project key."""
-        return requests.post(f"{self.BASE_URL}/api/projects/update_key", data={"from": old_key, "to": new_key}, auth=self.AUTH)
+        res = self.api.post("/api/projects/update_key", data={"from": old_key, "to": new_key}, auth=self.AUTH)
+        if res.status_code == 204:
+            self.project_factory.rename(old_key, new_key)
+        return res
 
     def update_visibility(self, key, visibility):
         """Update project visibility."""
-        return requests.post(f"{self.BASE_URL}/api/projects/update_visibility", data={"project": key, "visibility": visibility}, auth=self.AUTH)
+        return self.api.post("/api/projects/update_visibility", data={"project": key, "visibility": visibility}, auth=self.AUTH)
 
     # ---------- Tests ----------
     def test_create_search_delete_project(self):
         # Create
         res1 = self.create_project()
         self.assertEqual(res1.status_code, 200)
-        self.assertEqual(res1.json()["project"]["name"], self.PROJECT_NAME)
+        self.assertEqual(res1.json()["project"]["name"], self.project_name)
 
         # Search
         res2 = self.search_projects()
         self.assertEqual(res2.status_code, 200)
-        project_names = [p["name"] for p in res2.json()["components"]]
-        self.assertIn(self.PROJECT_NAME, project_names)
+        self.assertTrue(self.project_listed(self.project_key, self.project_name))
 
         # Delete
-        res3 = self.delete_project(self.PROJECT_KEY)
+        res3 = self.delete_project(self.project_key)
         self.assertEqual(res3.status_code, 204)
 
         # Verify deletion
-        res4 = self.search_projects()
-        self.assertNotIn(self.PROJECT_NAME, [p["name"] for p in res4.json()["components"]])
+        self.assertFalse(self.project_listed(self.project_key, self.project_name))
 
     def test_delete_a_not_found_proj(self):
         res = self.delete_project("NotExist")
@@ -70,18 +76,36 @@ class TestProjects(unittest.TestCase):
 
     def test_update_key(self):
         self.create_project()
-        res2 = self.update_key(self.PROJECT_KEY, "newKey")
+        res2 = self.update_key(self.project_key, self.new_key)
         self.assertEqual(res2.status_code, 204)
-        self.assertEqual(self.delete_project("newKey").status_code, 204)
+        self.assertEqual(self.delete_project(self.new_key).status_code, 204)
 
     def test_update_a_non_existing_key(self):
-        res = self.update_key("NotExist", "newKey")
+        res = self.update_key("NotExist", self.new_key)
         self.assertEqual(res.status_code, 404)
 
     def test_update_visibility(self):
         self.create_project()
-        res = self.update_visibility(self.PROJECT_KEY, "private")
+        res = self.update_visibility(self.project_key, "private")
         self.assertEqual(res.status_code, 204)
 
+    def test_concurrent_create_delete_projects(self):
+        keys = [f"{self.project_key}_bulk_{i}" for i in range(self.BULK_COUNT)]
+        for key in keys:
+            self.project_factory.track(key)
+
+        async def fan_out(path, payloads):
+            return await self.async_api.gather(
+                self.async_api.post(path, data=data, auth=self.AUTH) for data in payloads
+            )
+
+        created = asyncio.run(fan_out("/api/projects/create", [{"name": k, "project": k} for k in keys]))
+        self.assertEqual([r.status_code for r in created], [200] * len(keys))
+
+        deleted = asyncio.run(fan_out("/api/projects/delete", [{"project": k} for k in keys]))
+        self.assertEqual([r.status_code for r in deleted], [204] * len(keys))
+        for key in keys:
+            self.project_factory.forget(key)
+
 if __name__ == "__main__":
     unittest.main()
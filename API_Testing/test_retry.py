@@ -0,0 +1,138 @@
+import json
+import time
+import pytest
+import requests
+
+from API_Testing.client import ApiSessionWrapper
+from API_Testing.retry import CircuitOpenError, RetryPolicy
+
+
+# not polled by the health sampler, so injected faults only hit these tests
+SEARCH = "/api/projects/search"
+
+
+@pytest.fixture
+def faulty_server(fake_sonarqube):
+    """The in-process server, with any injected faults cleared after the test."""
+    if fake_sonarqube is None:
+        pytest.skip("fault injection needs the in-process server (--fake-sonarqube)")
+    yield fake_sonarqube
+    fake_sonarqube.inject_faults(0)
+
+
+@pytest.fixture
+def make_client(faulty_server):
+    """Build clients with their own RetryPolicy (the session's budget is left alone)."""
+    clients = []
+
+    def make(**policy):
+        # no real backoff: the delays are still computed and reported
+        clients.append(ApiSessionWrapper(faulty_server.base_url, retry=RetryPolicy(sleep=lambda s: None, **policy)))
+        return clients[-1]
+
+    yield make
+    for client in clients:
+        client.close()
+
+
+def test_transient_status_is_retried_and_reported(faulty_server, make_client, basic_auth, monkeypatch):
+    attached = []
+    monkeypatch.setattr("allure.attach", lambda body, **kwargs: attached.append(json.loads(body)))
+    client = make_client()
+    faulty_server.inject_faults(2, status=503, path=SEARCH)
+
+    resp = client.get(SEARCH, auth=basic_auth)
+
+    assert resp.status_code == 200
+    assert client.retry.retried == 2
+    assert [r["reason"] for r in attached[-1]["retries"]] == ["HTTP 503", "HTTP 503"]
+
+
+def test_connection_reset_is_retried(faulty_server, make_client, basic_auth):
+    client = make_client()
+    faulty_server.inject_faults(1, reset=True, path=SEARCH)
+
+    resp = client.get(SEARCH, auth=basic_auth)
+
+    assert resp.status_code == 200
+    assert [r["reason"] for r in resp._retries] == ["ConnectionError"]
+
+
+def test_retries_are_kept_when_the_last_attempt_fails(faulty_server, make_client, basic_auth, monkeypatch):
+    attached = []
+    monkeypatch.setattr("allure.attach", lambda body, **kwargs: attached.append(json.loads(body)))
+    client = make_client(max_retries=2)
+    faulty_server.inject_faults(3, reset=True, path=SEARCH)
+
+    with pytest.raises(requests.ConnectionError) as raised:
+        client.get(SEARCH, auth=basic_auth)
+
+    assert [r["reason"] for r in raised.value._retries] == ["ConnectionError", "ConnectionError"]
+    assert attached[-1]["retries"] == raised.value._retries
+
+
+def test_post_is_never_retried(faulty_server, make_client, basic_auth):
+    client = make_client()
+    faulty_server.inject_faults(1, status=503, path="/api/authentication/login")
+
+    resp = client.post("/api/authentication/login", auth=basic_auth)
+
+    assert resp.status_code == 503
+    assert client.retry.retried == 0
+
+
+def test_retry_budget_is_shared_across_calls(faulty_server, make_client, basic_auth):
+    client = make_client(max_retries=2, budget=3, breaker_threshold=100)
+    faulty_server.inject_faults(100, status=503, path=SEARCH)
+
+    attempts = []
+    for _ in range(3):
+        resp = client.get(SEARCH, auth=basic_auth)
+        assert resp.status_code == 503
+        attempts.append(len(getattr(resp, "_retries", [])))
+
+    # 2 retries, then the last unit of budget, then none left
+    assert attempts == [2, 1, 0]
+    assert client.retry.retried == 3
+    assert faulty_server.faults_left() == 100 - 6
+
+
+def test_circuit_breaker_fails_fast_then_lets_one_trial_through(faulty_server, make_client, basic_auth):
+    client = make_client(max_retries=0, breaker_threshold=2, breaker_cooldown=0.1)
+    faulty_server.inject_faults(2, status=503, path=SEARCH)
+
+    for _ in range(2):
+        assert client.get(SEARCH, auth=basic_auth).status_code == 503
+    assert client.retry.circuit_opens == 1
+
+    # open: the server is not called at all
+    with pytest.raises(CircuitOpenError):
+        client.get(SEARCH, auth=basic_auth)
+
+    # half-open: a single trial call goes through while the others still fail fast
+    time.sleep(0.15)
+    client.retry.before_call()
+    with pytest.raises(CircuitOpenError):
+        client.retry.before_call()
+    client.retry.record_outcome(failed=False)
+
+    # the trial succeeded: closed again
+    assert client.get(SEARCH, auth=basic_auth).status_code == 200
+
+
+def test_unexpected_error_does_not_leave_the_trial_in_flight(faulty_server, make_client, basic_auth, monkeypatch):
+    client = make_client(max_retries=0, breaker_threshold=1, breaker_cooldown=0)
+    faulty_server.inject_faults(1, status=503, path=SEARCH)
+    assert client.get(SEARCH, auth=basic_auth).status_code == 503
+
+    # the half-open trial blows up with something that is not a RequestException
+    def explode(*args):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(client, "_send_once", explode)
+    with pytest.raises(RuntimeError):
+        client.get(SEARCH, auth=basic_auth)
+    monkeypatch.undo()
+
+    # the failed trial re-opened the breaker, but the next trial is let through
+    assert client.get(SEARCH, auth=basic_auth).status_code == 200
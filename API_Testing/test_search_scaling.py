@@ -0,0 +1,74 @@
+import json
+import math
+import time
+import asyncio
+import statistics
+import allure
+import pytest
+
+from API_Testing.client import CAPTURE_OFF, ApiSessionWrapper, AsyncApiSessionWrapper
+from API_Testing.projects import iter_projects
+from Common.naming import resource_key
+
+
+def _timed(fn, repeat):
+    """Median wall time of `repeat` calls, plus the last return value."""
+    durations, value = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        value = fn()
+        durations.append(time.perf_counter() - started)
+    return statistics.median(durations), value
+
+
+def _growth_exponent(n_a, t_a, n_b, t_b):
+    """k in t ~ n^k between two measurements; k > 1 means superlinear growth."""
+    return math.log(max(t_b, 1e-9) / max(t_a, 1e-9)) / math.log(n_b / n_a)
+
+
+@pytest.mark.scaling
+def test_project_search_scaling(base_url, auth, project_factory, pytestconfig):
+    """Seed N projects per size, time search and full enumeration, reject superlinear growth.
+
+    Only runs with --scaling, e.g. pytest API_Testing/test_search_scaling.py --scaling --scaling-sizes 10,1000,10000
+    """
+    sizes = sorted(int(n) for n in pytestconfig.getoption("--scaling-sizes").split(","))
+    tolerance = pytestconfig.getoption("--scaling-tolerance")
+    prefix = resource_key("scale")
+
+    # seeding thousands of projects must not flood the Allure report
+    seeder = ApiSessionWrapper(base_url, pool_maxsize=16, persist_cookies=False, capture=CAPTURE_OFF)
+    async_seeder = AsyncApiSessionWrapper(seeder)
+
+    async def seed(keys):
+        return await async_seeder.gather(
+            async_seeder.post("/api/projects/create", data={"name": k, "project": k}, auth=auth) for k in keys
+        )
+
+    results, seeded = [], 0
+    try:
+        for n in sizes:
+            keys = [f"{prefix}_{i}" for i in range(seeded, n)]
+            for key in keys:
+                project_factory.track(key)
+            failed = [r.status_code for r in asyncio.run(seed(keys)) if r.status_code != 200]
+            assert not failed, f"seeding {n} projects failed: {failed[:5]}"
+            seeded = n
+
+            page_s, _ = _timed(lambda: seeder.get("/api/projects/search", params={"q": prefix, "ps": 100}, auth=auth), 5)
+            enum_s, count = _timed(lambda: sum(1 for _ in iter_projects(seeder, auth, page_size=500, q=prefix)), 3)
+            assert count == n, f"enumerated {count} projects, expected {n}"
+            results.append({"projects": n, "first_page_ms": round(page_s * 1000, 2), "enumerate_ms": round(enum_s * 1000, 2)})
+    finally:
+        seeder.close()
+
+    report = json.dumps(results, indent=2)
+    allure.attach(report, name="project_search_scaling", attachment_type=allure.attachment_type.JSON)
+
+    for a, b in zip(results, results[1:]):
+        for metric in ("first_page_ms", "enumerate_ms"):
+            k = _growth_exponent(a["projects"], a[metric], b["projects"], b[metric])
+            assert k <= 1 + tolerance, (
+                f"{metric} grew superlinearly from {a['projects']} to {b['projects']} projects "
+                f"({a[metric]}ms -> {b[metric]}ms, exponent {k:.2f})"
+            )
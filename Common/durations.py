@@ -0,0 +1,193 @@
+import os
+import json
+import glob
+import time
+import statistics
+import threading
+
+import pytest
+
+from Common.naming import worker_id
+from Common.reporting import write_json
+
+
+DEFAULT_DIR = os.environ.get("TEST_DURATIONS_DIR", "test-durations")
+# samples kept per test phase / fixture; estimates and baselines are medians over these
+HISTORY = 10
+PHASES = ("setup", "call", "teardown")
+# user property carrying fixture setup times on setup reports (reaches the xdist controller)
+FIXTURE_PROPERTY = "fixture_setup_s"
+
+
+def _merge_newest(target, entries):
+    for name, entry in entries.items():
+        known = target.get(name)
+        if known is None or entry.get("updated", 0) > known.get("updated", 0):
+            target[name] = entry
+
+
+class DurationStore:
+    """Recent per-test phase and per-fixture durations (seconds), persisted as JSON files in a directory.
+
+    Each run writes one file per suite and shard (see `run_suffix`), holding the
+    whole history it loaded plus its new samples. Loading merges all files in the
+    directory and keeps, per test or fixture, the entry sampled most recently, so
+    API/UI runs and parallel shards never overwrite each other's history. Two
+    concurrent runs of the same suite and shard do share a file; the last to
+    finish wins.
+
+    This run's samples are kept apart (`run`, `run_fixtures`) until `save`, so the
+    loaded history stays a baseline to compare them against. Fixtures get one
+    sample per run, the median of that run's setups.
+    """
+
+    def __init__(self, history=HISTORY):
+        self.history = history
+        self._lock = threading.Lock()
+        self.tests = {}
+        self.fixtures = {}
+        self.run = {}
+        self.run_fixtures = {}
+
+    @property
+    def updated(self):
+        return bool(self.run or self.run_fixtures)
+
+    def load(self, directory):
+        """Merge the history files in `directory` into this store (missing/unreadable files are ignored)."""
+        for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+                _merge_newest(self.tests, data.get("tests", {}))
+                _merge_newest(self.fixtures, data.get("fixtures", {}))
+            except (OSError, ValueError, AttributeError):
+                continue
+
+    def add(self, nodeid, phase, seconds):
+        with self._lock:
+            self.run.setdefault(nodeid, {}).setdefault(phase, []).append(round(seconds, 4))
+
+    def add_fixture(self, name, seconds):
+        with self._lock:
+            self.run_fixtures.setdefault(name, []).append(round(seconds, 4))
+
+    def median(self, nodeid, phase):
+        """Median of the previously recorded `phase` durations of a test; None when never sampled."""
+        samples = self.tests.get(nodeid, {}).get(phase)
+        return statistics.median(samples) if samples else None
+
+    def estimate(self, nodeid):
+        """Expected total duration (setup + call + teardown medians); None for unknown tests."""
+        medians = [self.median(nodeid, phase) for phase in PHASES]
+        known = [m for m in medians if m is not None]
+        return sum(known) if known else None
+
+    def _merged(self):
+        now = time.time()
+        tests = dict(self.tests)
+        for nodeid, phases in self.run.items():
+            entry = {k: list(v) for k, v in tests.get(nodeid, {}).items() if k in PHASES}
+            for phase, samples in phases.items():
+                entry[phase] = (entry.get(phase, []) + samples)[-self.history:]
+            tests[nodeid] = dict(entry, updated=now)
+        fixtures = dict(self.fixtures)
+        for name, samples in self.run_fixtures.items():
+            previous = fixtures.get(name, {}).get("samples", [])
+            fixtures[name] = {"samples": (previous + [round(statistics.median(samples), 4)])[-self.history:], "updated": now}
+        return tests, fixtures
+
+    def save(self, path):
+        """Write the history, including this run's samples, to `path` (best-effort)."""
+        with self._lock:
+            tests, fixtures = self._merged()
+        write_json(path, {"saved_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "tests": tests, "fixtures": fixtures})
+
+
+# process-wide, loaded and saved by the plugin hooks below
+durations = DurationStore()
+
+# [fixture name, seconds] set up in this process since the last setup report
+_pending_fixtures = []
+
+
+def run_suffix(config):
+    """'-API_Testing', or '-UI_Testing-shard2of4' under --shard: keeps per-suite/shard output files apart.
+
+    The suite is the top-level directory of the tests this run recorded.
+    """
+    suites = sorted({nodeid.split("::")[0].split("/")[0] for nodeid in durations.run})
+    suffix = f"-{'+'.join(suites)}" if suites else ""
+    shard = getattr(config, "shard", None)
+    return f"{suffix}-shard{shard[0]}of{shard[1]}" if shard else suffix
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--durations-dir",
+        action="store",
+        default=DEFAULT_DIR,
+        help="Directory of per-test duration history used by --shard (overrides TEST_DURATIONS_DIR, default test-durations)",
+    )
+    parser.addoption(
+        "--no-record-durations",
+        action="store_true",
+        default=False,
+        help="Use the duration history but do not add this run's timings to it",
+    )
+
+
+def pytest_configure(config):
+    durations.load(config.getoption("--durations-dir"))
+
+
+# child setup time of the fixtures being set up, innermost last
+_fixture_stack = []
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_fixture_setup(fixturedef, request):
+    # declared dependencies are set up before this hook runs, but fixtures pulled in
+    # with request.getfixturevalue() are set up inside it: their time is subtracted,
+    # so each fixture records only its own (exclusive) setup time
+    started = time.perf_counter()
+    _fixture_stack.append(0.0)
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        children = _fixture_stack.pop()
+        if _fixture_stack:
+            _fixture_stack[-1] += elapsed
+        _pending_fixtures.append([fixturedef.argname, elapsed - children])
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    if call.when == "setup" and _pending_fixtures:
+        report = outcome.get_result()
+        # a new list: the report shares item.user_properties with the call/teardown reports
+        report.user_properties = report.user_properties + [(FIXTURE_PROPERTY, list(_pending_fixtures))]
+        _pending_fixtures.clear()
+
+
+def pytest_runtest_logreport(report):
+    # with xdist the controller receives every worker's reports, so only it records
+    if worker_id() != "main" or report.when not in PHASES:
+        return
+    for name, value in report.user_properties:
+        if name == FIXTURE_PROPERTY:
+            for fixture, seconds in value:
+                durations.add_fixture(fixture, seconds)
+    # skipped tests would skew the estimate towards zero
+    if report.skipped or (report.when == "call" and report.failed):
+        return
+    durations.add(report.nodeid, report.when, report.duration)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    config = session.config
+    if worker_id() != "main" or not durations.updated or config.getoption("--no-record-durations"):
+        return
+    durations.save(os.path.join(config.getoption("--durations-dir"), f"durations{run_suffix(config)}.json"))
@@ -0,0 +1,40 @@
+import os
+import uuid
+import itertools
+
+
+# Shared by every test in this process; override with TEST_RUN_ID to make names
+# reproducible (e.g. when replaying recorded traffic).
+RUN_ID = os.environ.get("TEST_RUN_ID") or uuid.uuid4().hex[:6]
+
+_counter = itertools.count(1)
+
+
+def worker_id():
+    """Return the pytest-xdist worker id ('gw0', 'gw1', ...) or 'main' when not parallel."""
+    return os.environ.get("PYTEST_XDIST_WORKER", "main")
+
+
+def resource_key(prefix):
+    """Namespace a SonarQube key for this worker and run, e.g. 'my_project_gw1_3fa2c1'.
+
+    Parallel workers (and concurrent CI runs against one instance) then never
+    create, search or delete each other's projects.
+    """
+    return f"{prefix}_{worker_id()}_{RUN_ID}"
+
+
+def resource_name(prefix):
+    """Display-name counterpart of resource_key, e.g. 'My Project gw1 3fa2c1'."""
+    return f"{prefix} {worker_id()} {RUN_ID}"
+
+
+def unique_key(prefix):
+    """A resource_key that is also unique within the process (adds a counter)."""
+    return f"{resource_key(prefix)}_{next(_counter)}"
+
+
+def unique_name(prefix):
+    """Display-name counterpart of unique_key."""
+    return f"{resource_name(prefix)} {next(_counter)}"
+
@@ -0,0 +1,77 @@
+import os
+import time
+import random
+import requests
+
+from Common.reporting import per_worker_path, write_json
+
+
+DEFAULT_READY_TIMEOUT = 300.0
+INITIAL_DELAY = 0.5
+MAX_DELAY = 10.0
+
+
+class SonarQubeNotReady(RuntimeError):
+    """Raised when SonarQube does not report UP + GREEN within the timeout."""
+
+
+def backoff_delays(initial=INITIAL_DELAY, maximum=MAX_DELAY, rng=random.random):
+    """Yield exponential backoff delays with "full jitter" (uniform in [0, cap]).
+
+    The first polls come quickly, so a server that is already up costs almost
+    nothing, while a long startup is polled at most every `maximum` seconds.
+    """
+    attempt = 0
+    while True:
+        cap = min(maximum, initial * (2 ** attempt))
+        yield cap * rng()
+        attempt += 1
+
+
+def wait_until_ready(base_url, auth=None, timeout=DEFAULT_READY_TIMEOUT, session=None, sleep=time.sleep):
+    """Block until /api/system/status is UP and /api/system/health is GREEN.
+
+    Returns timing metrics (seconds until UP, until GREEN, number of polls) or
+    raises SonarQubeNotReady with the last observed state after `timeout` seconds.
+    """
+    base = base_url.rstrip("/")
+    http = session or requests.Session()
+    started = time.monotonic()
+    deadline = started + timeout
+    metrics = {"base_url": base, "attempts": 0, "up_after_s": None, "green_after_s": None}
+    last = "no response"
+    delays = backoff_delays()
+
+    try:
+        while True:
+            metrics["attempts"] += 1
+            try:
+                if metrics["up_after_s"] is None:
+                    status = http.get(f"{base}/api/system/status", timeout=5).json().get("status")
+                    last = f"status={status}"
+                    if status == "UP":
+                        metrics["up_after_s"] = round(time.monotonic() - started, 3)
+                if metrics["up_after_s"] is not None:
+                    resp = http.get(f"{base}/api/system/health", auth=auth, timeout=5)
+                    health = resp.json().get("health") if resp.ok else None
+                    last = f"health={health} (HTTP {resp.status_code})"
+                    if health == "GREEN":
+                        metrics["green_after_s"] = round(time.monotonic() - started, 3)
+                        return metrics
+            except (requests.RequestException, ValueError) as e:
+                last = f"{type(e).__name__}: {e}"
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise SonarQubeNotReady(
+                    f"SonarQube at {base} not ready after {timeout:.0f}s ({metrics['attempts']} polls, last: {last})"
+                )
+            sleep(min(next(delays), remaining))
+    finally:
+        if session is None:
+            http.close()
+
+
+def record_startup(metrics, results_dir="allure-results", config=None):
+    """Write readiness metrics next to the Allure results (best-effort), one file per shard and worker."""
+    write_json(per_worker_path(os.path.join(results_dir, "sonarqube-startup.json"), config), metrics)
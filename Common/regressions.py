@@ -0,0 +1,106 @@
+import os
+import statistics
+
+from Common.durations import durations, run_suffix
+from Common.naming import worker_id
+from Common.reporting import write_json
+
+
+DEFAULT_THRESHOLD = float(os.environ.get("DURATION_REGRESSION_THRESHOLD", "0.2"))
+# previous samples needed before a test or fixture has a baseline
+MIN_HISTORY = 3
+# slowdowns smaller than this are noise, whatever the ratio
+MIN_DELTA_S = 0.05
+COMPARED_PHASES = ("setup", "call")
+
+
+def _compare(kind, name, phase, current, previous, threshold):
+    if len(previous) < MIN_HISTORY or not current:
+        return None
+    median = statistics.median(current)
+    baseline = statistics.median(previous)
+    if baseline <= 0 or median - baseline < MIN_DELTA_S or median <= baseline * (1 + threshold):
+        return None
+    return {
+        "kind": kind,
+        "name": name,
+        "phase": phase,
+        "median_s": round(median, 3),
+        "baseline_s": round(baseline, 3),
+        "change": f"+{(median / baseline - 1):.0%}",
+        "history": len(previous),
+    }
+
+
+def find_regressions(store, threshold=DEFAULT_THRESHOLD):
+    """This run's test phases and fixtures whose median is more than `threshold` above their history's median.
+
+    Test setup and call are compared separately, so a slow fixture shows up as a
+    setup regression rather than inflating the test body. Fixtures are also
+    compared on their own (one sample per run), which pins a slowdown to e.g.
+    the Chrome startup instead of every UI test that uses it. Slowest first.
+    """
+    regressions = []
+    for nodeid, phases in store.run.items():
+        history = store.tests.get(nodeid, {})
+        for phase in COMPARED_PHASES:
+            found = _compare("test", nodeid, phase, phases.get(phase), history.get(phase, []), threshold)
+            if found:
+                regressions.append(found)
+    for name, samples in store.run_fixtures.items():
+        previous = store.fixtures.get(name, {}).get("samples", [])
+        found = _compare("fixture", name, "setup", samples, previous, threshold)
+        if found:
+            regressions.append(found)
+    return sorted(regressions, key=lambda r: r["median_s"] - r["baseline_s"], reverse=True)
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--duration-threshold",
+        action="store",
+        type=float,
+        default=None,
+        help=f"Flag tests/fixtures whose median duration is this fraction above their history (overrides DURATION_REGRESSION_THRESHOLD, default {DEFAULT_THRESHOLD})",
+    )
+    parser.addoption(
+        "--duration-report",
+        action="store",
+        default=os.path.join("allure-results", "duration-regressions.json"),
+        help="Where to write the duration regression summary",
+    )
+
+
+def pytest_sessionfinish(session, exitstatus):
+    config = session.config
+    if worker_id() != "main" or not durations.updated:
+        return
+    threshold = config.getoption("--duration-threshold")
+    threshold = DEFAULT_THRESHOLD if threshold is None else threshold
+    regressions = find_regressions(durations, threshold)
+    config.duration_regressions = regressions
+    root, ext = os.path.splitext(config.getoption("--duration-report"))
+    path = f"{root}{run_suffix(config)}{ext}"
+    write_json(
+        path,
+        {
+            "threshold": threshold,
+            "min_history": MIN_HISTORY,
+            "tests": len(durations.run),
+            "fixtures": len(durations.run_fixtures),
+            "regressions": regressions,
+        },
+    )
+    config.duration_report_path = path
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    regressions = getattr(config, "duration_regressions", None)
+    if regressions:
+        terminalreporter.write_line(
+            f"duration regressions: {len(regressions)} (see {config.duration_report_path})"
+        )
+        for r in regressions[:5]:
+            terminalreporter.write_line(
+                f"  {r['kind']} {r['name']} [{r['phase']}]: {r['median_s']}s vs {r['baseline_s']}s ({r['change']})"
+            )
@@ -0,0 +1,39 @@
+import os
+import json
+
+from Common.naming import worker_id
+
+
+def per_worker_path(path, config=None):
+    """`path` with the --shard of `config` and the xdist worker id before the extension.
+
+    e.g. report-shard2of3-gw1.json; either part is left out when not sharded or
+    not under xdist. Session-end reports are written by every worker of every
+    shard, and CI merges the shards' results into one directory, so each gets
+    its own file.
+    """
+    parts = []
+    shard = getattr(config, "shard", None)
+    if shard:
+        parts.append(f"shard{shard[0]}of{shard[1]}")
+    if worker_id() != "main":
+        parts.append(worker_id())
+    if not parts:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}-{'-'.join(parts)}{ext}"
+
+
+def write_json(path, data):
+    """Write `data` as indented JSON to `path`, creating its directory, and return the JSON string.
+
+    Reports must never fail a run, so write errors are ignored.
+    """
+    body = json.dumps(data, indent=2)
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            f.write(body)
+    except Exception:
+        pass
+    return body
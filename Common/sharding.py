@@ -0,0 +1,86 @@
+import os
+import heapq
+import statistics
+
+import pytest
+
+from Common.durations import durations
+
+
+# cost of an unknown test when there is no history at all
+DEFAULT_COST = 1.0
+
+
+def parse_shard(spec):
+    """'2/4' -> (2, 4); shards are numbered from 1."""
+    try:
+        index, total = (int(part) for part in spec.split("/"))
+    except (AttributeError, ValueError):
+        raise pytest.UsageError(f"--shard expects i/N (e.g. 2/4), got {spec!r}")
+    if not 1 <= index <= total:
+        raise pytest.UsageError(f"--shard {spec}: i must be between 1 and N")
+    return index, total
+
+
+def plan_shards(nodeids, total, estimate):
+    """Split `nodeids` into `total` shards with balanced expected durations.
+
+    Longest-processing-time first: tests are taken from the most to the least
+    expensive, each going to the shard with the smallest load so far. `estimate`
+    returns a test's expected seconds or None; unknown tests are costed at the
+    median of the known ones. Returns (shard index per nodeid, load per shard).
+    """
+    known = {nodeid: estimate(nodeid) for nodeid in nodeids}
+    costs = [cost for cost in known.values() if cost is not None]
+    fallback = statistics.median(costs) if costs else DEFAULT_COST
+    # ties broken by nodeid, so every xdist worker computes the same plan
+    ordered = sorted(nodeids, key=lambda n: (-(known[n] if known[n] is not None else fallback), n))
+    heap = [(0.0, shard) for shard in range(total)]
+    loads = [0.0] * total
+    assignment = {}
+    for nodeid in ordered:
+        load, shard = heapq.heappop(heap)
+        load += known[nodeid] if known[nodeid] is not None else fallback
+        assignment[nodeid] = shard
+        loads[shard] = load
+        heapq.heappush(heap, (load, shard))
+    return assignment, loads
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--shard",
+        action="store",
+        default=None,
+        help="Run only shard i of N (e.g. 2/4), balanced on the --durations-dir history (overrides TEST_SHARD)",
+    )
+
+
+def pytest_configure(config):
+    spec = config.getoption("--shard") or os.environ.get("TEST_SHARD")
+    config.shard = parse_shard(spec) if spec else None
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(config, items):
+    if not config.shard:
+        return
+    index, total = config.shard
+    assignment, loads = plan_shards([item.nodeid for item in items], total, durations.estimate)
+    selected, deselected = [], []
+    for item in items:
+        (selected if assignment[item.nodeid] == index - 1 else deselected).append(item)
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+    config.shard_plan = {"tests": len(selected), "estimated_s": loads[index - 1], "slowest_s": max(loads)}
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    plan = getattr(config, "shard_plan", None)
+    if plan:
+        index, total = config.shard
+        terminalreporter.write_line(
+            f"shard {index}/{total}: {plan['tests']} tests, "
+            f"estimated {plan['estimated_s']:.1f}s (slowest shard {plan['slowest_s']:.1f}s)"
+        )
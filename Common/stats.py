@@ -0,0 +1,31 @@
+import math
+
+
+def percentile(values, pct):
+    """Linear-interpolated percentile (0-100) of `values`; None when empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low, high = math.floor(rank), math.ceil(rank)
+    if low == high:
+        return ordered[low]
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(values, scale=1.0, digits=2):
+    """count/mean/p50/p95/p99/max of `values`, each multiplied by `scale` (e.g. 1000 for ms)."""
+    if not values:
+        return {"count": 0}
+
+    def fmt(v):
+        return round(v * scale, digits)
+
+    return {
+        "count": len(values),
+        "mean": fmt(sum(values) / len(values)),
+        "p50": fmt(percentile(values, 50)),
+        "p95": fmt(percentile(values, 95)),
+        "p99": fmt(percentile(values, 99)),
+        "max": fmt(max(values)),
+    }
@@ -0,0 +1,156 @@
+import gzip
+import json
+import queue
+import threading
+from uuid import uuid4
+
+import allure
+from allure_commons import plugin_manager
+
+
+DEFAULT_MAX_BYTES = 1_000_000
+TRUNCATION_NOTE = "\n[... {dropped} of {total} bytes dropped by the artifact size cap ...]\n"
+
+
+def _page_info(driver):
+	return f"URL: {driver.current_url}\nTitle: {driver.title}"
+
+
+def _browser_logs(driver):
+	# browser logs (may not be available in all environments)
+	return driver.get_log("browser") if hasattr(driver, "get_log") else None
+
+
+def _utf8(text):
+	return text.encode("utf-8")
+
+
+def _json(entries):
+	return json.dumps(entries, default=str, indent=2).encode("utf-8")
+
+
+# name, grab(driver), encode(raw) -> bytes, attachment type, which end survives truncation
+# (None: never truncated or compressed -- PNGs are already compressed, page info is tiny)
+ARTIFACTS = (
+	("screenshot", lambda d: d.get_screenshot_as_png(), bytes, allure.attachment_type.PNG, None),
+	("page_source", lambda d: d.page_source, _utf8, allure.attachment_type.HTML, "head"),
+	("page_info", _page_info, _utf8, allure.attachment_type.TEXT, None),
+	("browser_logs", _browser_logs, _json, allure.attachment_type.JSON, "tail"),
+)
+
+
+def _truncate(body, max_bytes, keep):
+	if not max_bytes or len(body) <= max_bytes:
+		return body, 0
+	dropped = len(body) - max_bytes
+	note = TRUNCATION_NOTE.format(dropped=dropped, total=len(body)).encode("utf-8")
+	if keep == "tail":
+		# the latest log entries are the interesting ones
+		return note + body[-max_bytes:], dropped
+	return body[:max_bytes] + note, dropped
+
+
+class ArtifactWriter:
+	"""Capture failure artifacts and write them on a background thread.
+
+	`capture(driver)` grabs the screenshot, page source, URL/title and browser logs
+	one after the other (WebDriver is not thread-safe, and chromedriver serves a
+	session's commands in turn anyway) and waits only for those, since the browser
+	may be quit right after the failing test. Each artifact is then registered as
+	an Allure attachment of the current test and its bytes are queued for the
+	writer thread, which applies `max_bytes` to the text artifacts (page source
+	keeps its head, logs keep their tail), gzips them when `compress` is set, and
+	hands the body to allure's `report_attached_data` hook, which the file logger
+	(and any other logger) uses to store it. At most `max_pending` artifacts are
+	queued before capture() waits for the writer. `close()` drains the queue; call
+	it before the session ends.
+
+	allure.attach() would encode and write on the calling thread, so attachments
+	are registered through allure-pytest's reporter directly (`_attach` reserves
+	the file name the test result points to). When that reporter is missing or its
+	private API fails, the artifact is attached with allure.attach() on the
+	calling thread instead.
+	"""
+
+	def __init__(self, config, max_bytes=DEFAULT_MAX_BYTES, compress=False, max_pending=32):
+		self._config = config
+		self.max_bytes = max_bytes
+		self.compress = compress
+		self._queue = queue.Queue(maxsize=max_pending)
+		self._thread = None
+		self.written = 0
+		self.bytes_written = 0
+		self.bytes_dropped = 0
+
+	def _reporter(self):
+		listener = self._config.pluginmanager.get_plugin("allure_listener")
+		return getattr(listener, "allure_logger", None)
+
+	def capture(self, driver):
+		if driver is None:
+			return
+		reporter = self._reporter()
+		for name, grab, encode, attachment_type, keep in ARTIFACTS:
+			try:
+				raw = grab(driver)
+			except Exception:
+				continue
+			if not raw:
+				continue
+			compress = self.compress and keep is not None
+			if compress:
+				attachment_type, extension = "application/gzip", f"{attachment_type.extension}.gz"
+			else:
+				extension = None
+			try:
+				file_name = reporter._attach(uuid4(), name=name, attachment_type=attachment_type, extension=extension)
+			except Exception:
+				# no allure-pytest reporter (or its private API changed): attach synchronously
+				try:
+					body, _ = self._prepare(raw, encode, keep, compress)
+					allure.attach(body, name=name, attachment_type=attachment_type, extension=extension)
+				except Exception:
+					pass
+				continue
+			if self._thread is None:
+				self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+				self._thread.start()
+			self._queue.put((file_name, raw, encode, keep, compress))
+
+	# ---------- writer thread ----------
+	def _run(self):
+		while True:
+			job = self._queue.get()
+			try:
+				if job is None:
+					return
+				self._write(*job)
+			except Exception:
+				# best-effort, like the rest of the reporting
+				pass
+			finally:
+				self._queue.task_done()
+
+	def _prepare(self, raw, encode, keep, compress):
+		body = encode(raw)
+		dropped = 0
+		if keep is not None:
+			body, dropped = _truncate(body, self.max_bytes, keep)
+		if compress:
+			body = gzip.compress(body, compresslevel=6)
+		return body, dropped
+
+	def _write(self, file_name, raw, encode, keep, compress):
+		body, dropped = self._prepare(raw, encode, keep, compress)
+		plugin_manager.hook.report_attached_data(body=body, file_name=file_name)
+		self.written += 1
+		self.bytes_written += len(body)
+		self.bytes_dropped += dropped
+
+	def close(self, timeout=60):
+		"""Wait for queued artifacts to be written, then stop the writer thread."""
+		if self._thread is None:
+			return
+		self._queue.put(None)
+		self._thread.join(timeout)
+		self._thread = None
@@ -0,0 +1,114 @@
+from fnmatch import fnmatchcase
+
+
+# Nothing the assertions look at: raster images, web fonts, avatars and analytics.
+# SVGs are left alone because SonarQube's logo/icons are SVG and visibility checks
+# (is_logo_displayed) depend on them having a size.
+DEFAULT_BLOCK_PATTERNS = (
+    # trailing '*' so cache-busting query strings (logo.png?v=123) still match
+    "*.png*",
+    "*.jpg*",
+    "*.jpeg*",
+    "*.gif*",
+    "*.webp*",
+    "*.ico*",
+    "*.woff*",
+    "*.ttf*",
+    "*.otf*",
+    "*gravatar.com/*",
+    "*google-analytics.com/*",
+    "*googletagmanager.com/*",
+)
+
+BASELINE_CACHE_KEY = "sonarqube-ui/resource-baseline"
+
+
+def parse_patterns(spec):
+    """'*.png,*.woff2' -> ('*.png', '*.woff2'); empty/None -> DEFAULT_BLOCK_PATTERNS."""
+    patterns = tuple(p.strip() for p in (spec or "").split(",") if p.strip())
+    return patterns or DEFAULT_BLOCK_PATTERNS
+
+
+def block_resources(driver, patterns):
+    """Make Chrome fail requests matching `patterns` ('*' wildcards) before they are sent.
+
+    Uses the CDP Network domain, so it only works on Chromium; returns False when
+    the browser does not support it and the run continues unblocked.
+    """
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+        return True
+    except Exception:
+        return False
+
+
+def _matches(url, patterns):
+    return bool(url) and any(fnmatchcase(url, p) for p in patterns)
+
+
+class ResourceUsage:
+    """Per-test network usage, split into what the block patterns cover and the rest.
+
+    Collected in every UI run: a run without --block-resources becomes the baseline
+    (kept in the pytest cache), and a run with it is compared against that baseline
+    to estimate the bytes and test time saved.
+    """
+
+    def __init__(self, patterns, blocking):
+        self.patterns = tuple(patterns)
+        self.blocking = blocking
+        self.tests = 0
+        self.call_seconds = 0.0
+        self.requests = 0
+        self.kb = 0.0
+        self.blockable_requests = 0
+        self.blockable_kb = 0.0
+        self.blocked_requests = 0
+
+    def add_test(self, requests, call_seconds):
+        """`requests` are (url, encoded bytes, blocked) tuples from network.take_requests."""
+        self.tests += 1
+        self.call_seconds += call_seconds or 0.0
+        for url, size, blocked in requests:
+            if blocked:
+                self.blocked_requests += 1
+                continue
+            self.requests += 1
+            self.kb += size / 1024
+            if _matches(url, self.patterns):
+                self.blockable_requests += 1
+                self.blockable_kb += size / 1024
+
+    def _per_test(self, value):
+        return round(value / self.tests, 2) if self.tests else 0.0
+
+    def as_baseline(self):
+        return {
+            "patterns": list(self.patterns),
+            "tests": self.tests,
+            "call_s_per_test": self._per_test(self.call_seconds),
+            "kb_per_test": self._per_test(self.kb),
+            "blockable_requests_per_test": self._per_test(self.blockable_requests),
+            "blockable_kb_per_test": self._per_test(self.blockable_kb),
+        }
+
+    def report(self, baseline=None):
+        """This run's usage; with blocking on and a matching baseline, the estimated savings."""
+        report = {
+            "blocking": self.blocking,
+            "patterns": list(self.patterns),
+            "tests": self.tests,
+            "call_s_per_test": self._per_test(self.call_seconds),
+            "requests_per_test": self._per_test(self.requests),
+            "kb_per_test": self._per_test(self.kb),
+            "blocked_requests": self.blocked_requests,
+            "blocked_requests_per_test": self._per_test(self.blocked_requests),
+        }
+        if self.blocking and baseline and baseline.get("patterns") == list(self.patterns):
+            report["baseline"] = baseline
+            # blocked requests are never downloaded, so their size comes from the baseline
+            report["est_kb_saved_per_test"] = baseline["blockable_kb_per_test"]
+            report["est_kb_saved_total"] = round(baseline["blockable_kb_per_test"] * self.tests, 2)
+            report["call_s_saved_per_test"] = round(baseline["call_s_per_test"] - report["call_s_per_test"], 3)
+        return report
@@ -0,0 +1,71 @@
+import os
+import re
+import shutil
+import functools
+import subprocess
+
+
+CACHE_PREFIX = "sonarqube-ui/chromedriver"
+CHROME_BINARIES = (
+	"google-chrome",
+	"google-chrome-stable",
+	"chromium",
+	"chromium-browser",
+	"/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+)
+
+# per-process memo: {chrome version: chromedriver path or None}
+_resolved = {}
+
+
+@functools.lru_cache(maxsize=None)
+def chrome_version():
+	"""Version of the installed Chrome (e.g. '126.0.6478.126'), or None if not found.
+
+	CHROME_VERSION overrides detection (useful when Chrome lives somewhere unusual).
+	"""
+	if os.environ.get("CHROME_VERSION"):
+		return os.environ["CHROME_VERSION"]
+	for binary in CHROME_BINARIES:
+		path = shutil.which(binary) or (binary if os.path.isfile(binary) else None)
+		if not path:
+			continue
+		try:
+			out = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=10).stdout
+		except (OSError, subprocess.SubprocessError):
+			continue
+		match = re.search(r"\d+(?:\.\d+)+", out)
+		if match:
+			return match.group(0)
+	return None
+
+
+def _install():
+	try:
+		# webdriver-manager is optional and slow to import; only load it on a cache miss
+		from webdriver_manager.chrome import ChromeDriverManager
+	except Exception:
+		return None
+	return ChromeDriverManager().install()
+
+
+def resolve_chromedriver(cache=None):
+	"""Path to a chromedriver matching the installed Chrome, or None to use the one on PATH.
+
+	webdriver-manager resolves (and version-checks online) on every install() call,
+	so the result is memoized for the process and, when `cache` (pytest's
+	config.cache) is given, stored across runs keyed on the Chrome version. A
+	cached path is reused as long as the binary still exists; a Chrome upgrade
+	changes the key and triggers a fresh install.
+	"""
+	version = chrome_version()
+	if version in _resolved:
+		return _resolved[version]
+	key = f"{CACHE_PREFIX}/{version}"
+	path = cache.get(key, None) if cache is not None and version else None
+	if not (path and os.path.isfile(path)):
+		path = _install()
+		if path and cache is not None and version:
+			cache.set(key, path)
+	_resolved[version] = path
+	return path
@@ -1,16 +1,20 @@
 import os
-import json
+import unittest
 import allure
 import pytest
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
 
-try:
-	# webdriver-manager makes local development easier by auto-downloading drivers
-	from webdriver_manager.chrome import ChromeDriverManager
-except Exception:
-	ChromeDriverManager = None
+from UI_Testing.artifacts import DEFAULT_MAX_BYTES, ArtifactWriter
+from UI_Testing.blocking import BASELINE_CACHE_KEY, ResourceUsage, block_resources, parse_patterns
+from UI_Testing.chromedriver import resolve_chromedriver
+from UI_Testing.driver_pool import DriverPool
+from UI_Testing.locators import timings as locator_timings
+from UI_Testing.network import LOGGING_PREFS as NETWORK_LOGGING_PREFS, PERF_LOGGING_PREFS, take_requests
+from UI_Testing.perf import append_trend, find_regressions, perf, read_trend
+from UI_Testing.pages import LoginPage, fetch_session_cookies
+from Common.naming import RUN_ID, worker_id
+from Common.readiness import DEFAULT_READY_TIMEOUT, record_startup, wait_until_ready
+from Common.reporting import per_worker_path, write_json
+from requests.auth import HTTPBasicAuth
 
 
 @pytest.fixture(scope="session")
@@ -30,6 +34,19 @@ def pytest_addoption(parser):
 		default=None,
 		help="Base URL for the application under test (overrides BASE_URL env var)",
 	)
+	parser.addoption(
+		"--ready-timeout",
+		action="store",
+		type=float,
+		default=None,
+		help="Seconds to wait for SonarQube to be UP and GREEN before running tests (overrides READY_TIMEOUT, default 300)",
+	)
+	parser.addoption(
+		"--skip-ready-check",
+		action="store_true",
+		default=False,
+		help="Do not wait for SonarQube readiness at session start",
+	)
 	parser.addoption(
 		"--headless",
 		action="store_true",
@@ -42,16 +59,111 @@ def pytest_addoption(parser):
 		default="chrome",
 		help="Browser to use (chrome).",
 	)
+	parser.addoption(
+		"--reuse-driver",
+		action="store_true",
+		default=False,
+		help="Reuse browsers across tests from a session pool, resetting state in between (or REUSE_DRIVER=true)",
+	)
+	parser.addoption(
+		"--driver-max-uses",
+		action="store",
+		type=int,
+		default=None,
+		help="Recycle a pooled browser after this many tests (overrides DRIVER_MAX_USES, default 50)",
+	)
+	parser.addoption(
+		"--locator-report",
+		action="store",
+		default=os.path.join("allure-results", "locator-timings.json"),
+		help="Where to write per-locator lookup times at session end",
+	)
+	parser.addoption(
+		"--block-resources",
+		action="store_true",
+		default=False,
+		help="Block images, web fonts, avatars and analytics in the browser via CDP (or UI_BLOCK_RESOURCES=true)",
+	)
+	parser.addoption(
+		"--block-patterns",
+		action="store",
+		default=None,
+		help="Comma-separated URL patterns ('*' wildcards) to block instead of the defaults (overrides UI_BLOCK_PATTERNS)",
+	)
+	parser.addoption(
+		"--resource-report",
+		action="store",
+		default=os.path.join("allure-results", "resource-blocking.json"),
+		help="Where to write per-test network usage and --block-resources savings",
+	)
+	parser.addoption(
+		"--collect-perf",
+		action="store_true",
+		default=False,
+		help="Record Navigation Timing / paint / LCP per page transition in the page objects (or UI_COLLECT_PERF=true)",
+	)
+	parser.addoption(
+		"--perf-report",
+		action="store",
+		default=os.path.join("allure-results", "ui-perf.json"),
+		help="Where to write the per-page browser metrics with --collect-perf",
+	)
+	parser.addoption(
+		"--perf-trend",
+		action="store",
+		default=os.path.join("perf-history", "ui-perf.jsonl"),
+		help="JSON-lines file that each --collect-perf run appends its per-page medians to (and is compared against)",
+	)
+	parser.addoption(
+		"--artifact-max-bytes",
+		action="store",
+		type=int,
+		default=None,
+		help=f"Cap page source / browser logs attached on failure to N bytes; 0 disables (overrides UI_ARTIFACT_MAX_BYTES, default {DEFAULT_MAX_BYTES})",
+	)
+	parser.addoption(
+		"--artifact-gzip",
+		action="store_true",
+		default=False,
+		help="Gzip page source and browser logs attached on failure (or UI_ARTIFACT_GZIP=true)",
+	)
 
 
-@pytest.fixture(scope="function")
-def driver(request, pytestconfig):
-	"""Create a WebDriver instance for tests and attach helpful artifacts on failure.
+def _credentials():
+	"""Admin credentials from SONARQUBE_USERNAME / SONARQUBE_PASSWORD (default admin)."""
+	return (
+		os.environ.get("SONARQUBE_USERNAME") or "admin",
+		os.environ.get("SONARQUBE_PASSWORD") or "Mypassword1?",
+	)
 
-	- Uses Chrome by default and webdriver-manager if available.
-	- Honors the --headless flag or HEADLESS env var.
-	- Attaches screenshot, page source and browser logs to Allure on failures.
+
+@pytest.fixture(scope="session", autouse=True)
+def sonarqube_ready(pytestconfig, base_url):
+	"""Block the session until SonarQube reports UP and GREEN, polling with backoff.
+
+	Startup timings are written to allure-results/sonarqube-startup.json and shown
+	in the terminal summary. Skipped with --skip-ready-check.
 	"""
+	if pytestconfig.getoption("--skip-ready-check"):
+		return None
+	timeout = pytestconfig.getoption("--ready-timeout") or float(
+		os.environ.get("READY_TIMEOUT", DEFAULT_READY_TIMEOUT)
+	)
+	metrics = wait_until_ready(base_url, auth=HTTPBasicAuth(*_credentials()), timeout=timeout)
+	record_startup(metrics, config=pytestconfig)
+	pytestconfig.sonarqube_startup = metrics
+	return metrics
+
+
+def _create_driver(pytestconfig):
+	"""Launch a Chrome WebDriver configured from CLI options / env vars.
+
+	Selenium's webdriver stack is imported here rather than at module level so
+	collection (and runs where no browser is needed) does not pay for it.
+	"""
+	from selenium import webdriver
+	from selenium.webdriver.chrome.options import Options
+	from selenium.webdriver.chrome.service import Service
 
 	browser = pytestconfig.getoption("--browser") or os.environ.get("BROWSER", "chrome")
 	headless_flag = pytestconfig.getoption("--headless") or (
@@ -68,35 +180,75 @@ def driver(request, pytestconfig):
 	if headless_flag:
 		options.add_argument("--headless=new" if hasattr(Options(), "add_argument") else "--headless")
 
-	# enable logging for browser console if possible
+	# enable logging for browser console if possible; Selenium 4.10+ dropped the
+	# desired_capabilities argument, so the capability is set on the options.
+	# The performance log carries CDP Network events for wait_for_network_idle.
 	try:
-		from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
-
-		caps = DesiredCapabilities.CHROME.copy()
-		caps["goog:loggingPrefs"] = {"browser": "ALL"}
+		options.set_capability("goog:loggingPrefs", {"browser": "ALL", **NETWORK_LOGGING_PREFS})
+		options.add_experimental_option("perfLoggingPrefs", PERF_LOGGING_PREFS)
 	except Exception:
-		caps = None
+		pass
 
-	driver = None
 	try:
-		if ChromeDriverManager:
-			service = Service(ChromeDriverManager().install())
-			if caps:
-				driver = webdriver.Chrome(service=service, options=options, desired_capabilities=caps)
-			else:
-				driver = webdriver.Chrome(service=service, options=options)
+		# webdriver-manager's download, cached per Chrome version across runs
+		# (only memoized for the process under -p no:cacheprovider)
+		driver_path = resolve_chromedriver(getattr(pytestconfig, "cache", None))
+		if driver_path:
+			driver = webdriver.Chrome(service=Service(driver_path), options=options)
 		else:
 			# Fallback: rely on chromedriver being in PATH
-			if caps:
-				driver = webdriver.Chrome(options=options, desired_capabilities=caps)
-			else:
-				driver = webdriver.Chrome(options=options)
+			driver = webdriver.Chrome(options=options)
 	except Exception as e:
 		# Re-raise with a clearer message
 		raise RuntimeError(
 			"Failed to create Chrome WebDriver. Ensure Chrome/Chromedriver are installed or install webdriver-manager. Original error: "
 			+ str(e)
 		)
+	if _blocking(pytestconfig):
+		block_resources(driver, _block_patterns(pytestconfig))
+	return driver
+
+
+def _blocking(pytestconfig):
+	return pytestconfig.getoption("--block-resources") or (
+		os.environ.get("UI_BLOCK_RESOURCES", "false").lower() == "true"
+	)
+
+
+def _block_patterns(pytestconfig):
+	return parse_patterns(pytestconfig.getoption("--block-patterns") or os.environ.get("UI_BLOCK_PATTERNS"))
+
+
+def _reuse_driver(pytestconfig):
+	return pytestconfig.getoption("--reuse-driver") or (
+		os.environ.get("REUSE_DRIVER", "false").lower() == "true"
+	)
+
+
+@pytest.fixture(scope="session")
+def driver_pool(pytestconfig):
+	"""Session-wide pool of browsers used when --reuse-driver / REUSE_DRIVER is set."""
+	max_uses = pytestconfig.getoption("--driver-max-uses") or int(os.environ.get("DRIVER_MAX_USES", "50"))
+	pool = DriverPool(lambda: _create_driver(pytestconfig), max_uses=max_uses)
+	yield pool
+	pool.close()
+
+
+@pytest.fixture(scope="function")
+def driver(request, pytestconfig, resource_usage):
+	"""Create a WebDriver instance for tests and attach helpful artifacts on failure.
+
+	- Uses Chrome by default and webdriver-manager if available (the resolved
+	  chromedriver path is cached per Chrome version, see UI_Testing/chromedriver.py).
+	- Honors the --headless flag or HEADLESS env var.
+	- With --reuse-driver, browsers come from a session pool and are reset (cookies,
+	  storage, about:blank) between tests instead of being relaunched.
+	- Attaches screenshot, page source and browser logs to Allure on failures.
+	- With --block-resources, images/fonts/analytics are blocked (see UI_Testing/blocking.py);
+	  every test's network usage is tallied either way.
+	"""
+	pool = request.getfixturevalue("driver_pool") if _reuse_driver(pytestconfig) else None
+	driver = pool.acquire() if pool else _create_driver(pytestconfig)
 
 	# Make driver accessible on the node for hooks
 	request.node.driver = driver
@@ -104,51 +256,142 @@ def driver(request, pytestconfig):
 	yield driver
 
 	# Teardown handled here; attachments on failure are performed in pytest_runtest_makereport hook
+	rep = getattr(request.node, "rep_call", None)
+	try:
+		resource_usage.add_test(take_requests(driver), rep.duration if rep else None)
+	except Exception:
+		pass
+	if pool:
+		# a failed test may have left the browser in an odd state; replace it
+		pool.release(driver, healthy=not (rep and rep.failed))
+		return
 	try:
 		driver.quit()
 	except Exception:
 		pass
 
 
+@pytest.fixture(scope="session")
+def resource_usage(pytestconfig):
+	"""Per-test network usage, reported against the cached unblocked baseline at session end.
+
+	Runs without --block-resources store their usage in the pytest cache as the
+	baseline; runs with it report blocked requests plus the estimated KB and test
+	time saved versus that baseline (--resource-report, Allure, terminal summary).
+	"""
+	usage = ResourceUsage(_block_patterns(pytestconfig), blocking=_blocking(pytestconfig))
+	yield usage
+	if not (usage.requests or usage.blocked_requests):
+		# no performance log data (e.g. no browser was launched)
+		return
+	# no baseline to read or store under -p no:cacheprovider
+	cache = getattr(pytestconfig, "cache", None)
+	try:
+		baseline = cache.get(BASELINE_CACHE_KEY, None) if cache is not None else None
+		report = usage.report(baseline)
+		if not usage.blocking and cache is not None:
+			cache.set(BASELINE_CACHE_KEY, usage.as_baseline())
+		pytestconfig.resource_report = report
+		body = write_json(per_worker_path(pytestconfig.getoption("--resource-report"), pytestconfig), report)
+		allure.attach(body, name="resource_blocking", attachment_type=allure.attachment_type.JSON)
+	except Exception:
+		pass
+
+
+@pytest.fixture(scope="session", autouse=True)
+def page_perf(pytestconfig):
+	"""Opt-in per-page browser metrics (--collect-perf), reported at session end.
+
+	The page objects record each transition; here the per-page aggregates are
+	compared with the last runs in the --perf-trend file, written to --perf-report,
+	attached to Allure and appended to the trend file.
+	"""
+	perf.enabled = pytestconfig.getoption("--collect-perf") or (
+		os.environ.get("UI_COLLECT_PERF", "false").lower() == "true"
+	)
+	yield perf
+	if not perf.enabled:
+		return
+	try:
+		summary = perf.summary()
+		if not summary:
+			return
+		trend_path = pytestconfig.getoption("--perf-trend")
+		regressions = find_regressions(summary, read_trend(trend_path))
+		pytestconfig.ui_perf_regressions = regressions
+		body = write_json(
+			per_worker_path(pytestconfig.getoption("--perf-report"), pytestconfig),
+			{"pages": summary, "regressions": regressions},
+		)
+		allure.attach(body, name="ui_page_performance", attachment_type=allure.attachment_type.JSON)
+		append_trend(
+			trend_path,
+			summary,
+			run_id=RUN_ID,
+			worker=worker_id(),
+			base_url=os.environ.get("BASE_URL"),
+			commit=os.environ.get("GITHUB_SHA"),
+		)
+	except Exception:
+		pass
+
+
+@pytest.fixture(scope="session")
+def ui_session_cookies(base_url):
+	"""Log in once per session through the API and return the session cookies."""
+	return fetch_session_cookies(base_url, *_credentials())
+
+
+@pytest.fixture
+def authenticated_driver(driver, base_url, ui_session_cookies):
+	"""A `driver` that is already logged in, skipping the UI login form."""
+	LoginPage(driver).login_via_api(base_url, cookies=ui_session_cookies)
+	return driver
+
+
+@pytest.fixture(autouse=True)
+def _bind_unittest_driver(request, base_url):
+	"""Expose the `driver` fixture and base URL on unittest.TestCase classes.
+
+	unittest classes cannot request fixtures directly, so `self.driver` and
+	`self.BASE_URL` are bound as class attributes before each test. Classes or
+	tests marked `@pytest.mark.authenticated` get an already logged-in driver.
+	"""
+	if request.cls is None or not issubclass(request.cls, unittest.TestCase):
+		yield
+		return
+	fixture = "authenticated_driver" if request.node.get_closest_marker("authenticated") else "driver"
+	request.cls.driver = request.getfixturevalue(fixture)
+	request.cls.BASE_URL = base_url
+	yield
+
+
 def _attach_browser_state(node, driver):
-	"""Best-effort attachments: screenshot, page source, current URL/title, and browser logs."""
+	"""Best-effort attachments: screenshot, page source, current URL/title, and browser logs.
+
+	Grabbed in turn; encoding, size caps, compression and writing happen on the
+	session's background ArtifactWriter so the failing test's teardown is not held up.
+	"""
 	try:
-		if driver:
-			try:
-				png = driver.get_screenshot_as_png()
-				allure.attach(png, name="screenshot", attachment_type=allure.attachment_type.PNG)
-			except Exception:
-				pass
-
-			try:
-				src = driver.page_source
-				allure.attach(src, name="page_source", attachment_type=allure.attachment_type.HTML)
-			except Exception:
-				pass
-
-			try:
-				url = driver.current_url
-				title = driver.title
-				allure.attach(f"URL: {url}\nTitle: {title}", name="page_info", attachment_type=allure.attachment_type.TEXT)
-			except Exception:
-				pass
-
-			# browser logs (may not be available in all environments)
-			try:
-				logs = []
-				if hasattr(driver, "get_log"):
-					for entry in driver.get_log("browser"):
-						logs.append(entry)
-				if logs:
-					allure.attach(json.dumps(logs, default=str, indent=2), name="browser_logs", attachment_type=allure.attachment_type.JSON)
-			except Exception:
-				pass
+		writer = getattr(node.config, "artifact_writer", None)
+		if driver and writer:
+			writer.capture(driver)
 	except Exception:
 		# swallow any unexpected errors during best-effort attachments
 		pass
 
 
 def pytest_configure(config):
+	config.addinivalue_line(
+		"markers",
+		"authenticated: start the test with a browser logged in through the API (skips the login form)",
+	)
+	max_bytes = config.getoption("--artifact-max-bytes")
+	config.artifact_writer = ArtifactWriter(
+		config,
+		max_bytes=max_bytes if max_bytes is not None else int(os.environ.get("UI_ARTIFACT_MAX_BYTES", DEFAULT_MAX_BYTES)),
+		compress=config.getoption("--artifact-gzip") or os.environ.get("UI_ARTIFACT_GZIP", "false").lower() == "true",
+	)
 	# Add some environment properties visible in the Allure report
 	try:
 		os.makedirs("allure-results", exist_ok=True)
@@ -224,6 +467,8 @@ def pytest_runtest_makereport(item, call):
 	# Hook to attach screenshot, page source, console logs and traceback when a test fails
 	outcome = yield
 	rep = outcome.get_result()
+	# expose per-phase reports to fixtures (e.g. the driver pool recycles after failures)
+	setattr(item, "rep_" + rep.when, rep)
 	if rep.when == "call" and rep.failed:
 		driver = getattr(item, "driver", None) or getattr(item, "_driver", None) or getattr(item, "_request", None)
 		# request.node.driver is the more reliable location
@@ -248,3 +493,41 @@ def pytest_runtest_makereport(item, call):
 			allure.attach(longrepr, name="traceback", attachment_type=allure.attachment_type.TEXT)
 		except Exception:
 			pass
+
+
+def pytest_sessionfinish(session, exitstatus):
+	# drain failure artifacts still queued for the background writer
+	writer = getattr(session.config, "artifact_writer", None)
+	if writer:
+		writer.close()
+	path = session.config.getoption("--locator-report")
+	if path and locator_timings.summary():
+		write_json(per_worker_path(path, session.config), locator_timings.summary())
+
+
+def pytest_terminal_summary(terminalreporter, config):
+	metrics = getattr(config, "sonarqube_startup", None)
+	if metrics:
+		terminalreporter.write_line(
+			f"SonarQube ready (GREEN) after {metrics['green_after_s']}s, {metrics['attempts']} polls"
+		)
+	report = getattr(config, "resource_report", None)
+	if report and report["blocking"]:
+		line = f"Blocked {report['blocked_requests']} requests ({report['blocked_requests_per_test']}/test)"
+		if "est_kb_saved_per_test" in report:
+			line += (
+				f", ~{report['est_kb_saved_per_test']} KB and {report['call_s_saved_per_test']}s saved per test"
+				" vs the unblocked baseline"
+			)
+		terminalreporter.write_line(line)
+	for regression in getattr(config, "ui_perf_regressions", None) or []:
+		terminalreporter.write_line(
+			f"UI perf regression: {regression['page']} {regression['metric']} p50 {regression['p50']}ms "
+			f"vs {regression['baseline_p50']}ms ({regression['change']})"
+		)
+	writer = getattr(config, "artifact_writer", None)
+	if writer and writer.written:
+		terminalreporter.write_line(
+			f"Failure artifacts: {writer.written} written ({writer.bytes_written // 1024} KiB), "
+			f"{writer.bytes_dropped // 1024} KiB dropped by the size cap"
+		)
@@ -0,0 +1,70 @@
+from selenium.common.exceptions import WebDriverException
+
+
+RESET_STORAGE_SCRIPT = "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}"
+
+
+class DriverPool:
+	"""Keep WebDriver instances alive across tests and reset their state between uses.
+
+	- `factory` is a zero-argument callable returning a new WebDriver.
+	- A browser is recycled (quit and replaced) after `max_uses` checkouts, or as soon
+	  as it stops answering (crashed renderer, lost chromedriver session).
+	- Between tests cookies, localStorage and sessionStorage are cleared and the
+	  browser is parked on about:blank, so each test starts from a clean slate
+	  without paying for a new browser process.
+	"""
+
+	def __init__(self, factory, max_uses=50):
+		self._factory = factory
+		self._max_uses = max_uses
+		self._idle = []
+		self._uses = {}
+
+	def acquire(self):
+		while self._idle:
+			driver = self._idle.pop()
+			if self._is_alive(driver):
+				self._uses[driver] += 1
+				return driver
+			self._discard(driver)
+		driver = self._factory()
+		self._uses[driver] = 1
+		return driver
+
+	def release(self, driver, healthy=True):
+		"""Return a driver to the pool; recycle it if worn out, broken or not resettable."""
+		if not healthy or self._uses.get(driver, 0) >= self._max_uses or not self.reset(driver):
+			self._discard(driver)
+			return
+		self._idle.append(driver)
+
+	@staticmethod
+	def reset(driver):
+		try:
+			driver.delete_all_cookies()
+			# storage is per-origin, so clear it before leaving the application page
+			driver.execute_script(RESET_STORAGE_SCRIPT)
+			driver.get("about:blank")
+			return True
+		except WebDriverException:
+			return False
+
+	@staticmethod
+	def _is_alive(driver):
+		try:
+			driver.current_url
+			return True
+		except WebDriverException:
+			return False
+
+	def _discard(self, driver):
+		self._uses.pop(driver, None)
+		try:
+			driver.quit()
+		except Exception:
+			pass
+
+	def close(self):
+		while self._idle:
+			self._discard(self._idle.pop())
@@ -0,0 +1,177 @@
+import time
+import threading
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from selenium.webdriver.common.by import By
+
+from Common.stats import summarize
+from UI_Testing.network import wait_for_network_idle
+from UI_Testing.perf import perf
+
+
+DEFAULT_TIMEOUT = 10
+POLL_INTERVAL = 0.1
+STALE_RETRIES = 3
+
+VISIBLE = "visible"
+CLICKABLE = "clickable"
+PRESENT = "present"
+
+
+class Locator:
+    """A named (strategy, selector) pair.
+
+    Iterates like the plain tuple, so `driver.find_element(*locator)` keeps working.
+    `format()` fills templated selectors, e.g. a link located by its text.
+    """
+
+    def __init__(self, by, value, name=None):
+        self.by = by
+        self.value = value
+        self.name = name or f"{by}={value}"
+
+    def __iter__(self):
+        return iter((self.by, self.value))
+
+    def __repr__(self):
+        return f"Locator({self.name!r}: {self.by}={self.value!r})"
+
+    def format(self, **kwargs):
+        return Locator(self.by, self.value.format(**kwargs), self.name)
+
+
+def css(value, name=None):
+    return Locator(By.CSS_SELECTOR, value, name)
+
+
+def by_id(value, name=None):
+    return Locator(By.ID, value, name)
+
+
+def xpath(value, name=None):
+    """XPath only for what CSS cannot express (matching on text)."""
+    return Locator(By.XPATH, value, name)
+
+
+class LocatorTimings:
+    """Thread-safe lookup durations per locator name, to find slow or flaky selectors."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = {}
+
+    def _entry(self, locator):
+        return self._samples.setdefault(
+            locator.name, {"selector": f"{locator.by}={locator.value}", "seconds": [], "misses": 0, "stale_retries": 0}
+        )
+
+    def record(self, locator, seconds, found=True):
+        with self._lock:
+            entry = self._entry(locator)
+            entry["seconds"].append(seconds)
+            entry["misses"] += 0 if found else 1
+
+    def record_stale(self, locator):
+        with self._lock:
+            self._entry(locator)["stale_retries"] += 1
+
+    def summary(self):
+        """Per-locator lookup percentiles in milliseconds, slowest p95 first."""
+        with self._lock:
+            samples = {k: dict(v, seconds=list(v["seconds"])) for k, v in self._samples.items()}
+        report = {
+            name: {
+                "selector": entry["selector"],
+                "misses": entry["misses"],
+                "stale_retries": entry["stale_retries"],
+                "lookup_ms": summarize(entry["seconds"], scale=1000),
+            }
+            for name, entry in samples.items()
+        }
+        return dict(sorted(report.items(), key=lambda kv: kv[1]["lookup_ms"]["p95"], reverse=True))
+
+
+# process-wide, written out by the conftest at session end
+timings = LocatorTimings()
+
+
+def wait_for(scope, locator, condition=VISIBLE, timeout=DEFAULT_TIMEOUT, poll=POLL_INTERVAL):
+    """Wait until `locator` satisfies `condition` under `scope` (a driver or an element).
+
+    Polls every `poll` seconds instead of relying on an implicit wait, ignores stale
+    references while polling, and records the lookup time under the locator's name.
+    """
+    # selenium.webdriver.support pulls in the whole remote webdriver stack, so it is
+    # imported on first wait instead of when the page objects are collected
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
+    expected = {
+        VISIBLE: EC.visibility_of_element_located,
+        CLICKABLE: EC.element_to_be_clickable,
+        PRESENT: EC.presence_of_element_located,
+    }[condition](tuple(locator))
+    started = time.perf_counter()
+    try:
+        element = WebDriverWait(
+            scope, timeout, poll_frequency=poll, ignored_exceptions=(StaleElementReferenceException,)
+        ).until(expected, f"{locator.name} not {condition} after {timeout}s")
+    except TimeoutException:
+        timings.record(locator, time.perf_counter() - started, found=False)
+        raise
+    timings.record(locator, time.perf_counter() - started)
+    return element
+
+
+class BasePage:
+    """Page object base: every lookup goes through `wait_for` (no implicit waits).
+
+    Interactions re-locate and retry up to STALE_RETRIES times when the element
+    goes stale between lookup and use (e.g. a React re-render).
+    """
+
+    def __init__(self, driver, timeout=DEFAULT_TIMEOUT):
+        self.driver = driver
+        self.timeout = timeout
+
+    def find(self, locator, condition=VISIBLE, timeout=None, within=None):
+        return wait_for(within or self.driver, locator, condition, self.timeout if timeout is None else timeout)
+
+    def _interact(self, locator, action, condition, timeout, within):
+        for attempt in range(STALE_RETRIES):
+            element = self.find(locator, condition, timeout, within)
+            try:
+                return action(element)
+            except StaleElementReferenceException:
+                if attempt == STALE_RETRIES - 1:
+                    raise
+                timings.record_stale(locator)
+
+    def click(self, locator, timeout=None, within=None, condition=CLICKABLE):
+        self._interact(locator, lambda el: el.click(), condition, timeout, within)
+
+    def type(self, locator, text, clear=False, timeout=None):
+        def send(el):
+            if clear:
+                el.clear()
+            el.send_keys(text)
+
+        self._interact(locator, send, VISIBLE, timeout, None)
+
+    def text(self, locator, timeout=None):
+        return self._interact(locator, lambda el: el.text, VISIBLE, timeout, None)
+
+    def settle(self, idle_ms=None, timeout=None):
+        """After an action, wait for the app's XHR/fetch calls to settle (see UI_Testing/network.py)."""
+        return wait_for_network_idle(self.driver, idle_ms, self.timeout if timeout is None else timeout)
+
+    def transition(self, page):
+        """Context manager around an action that lands on `page`; records browser timings with --collect-perf."""
+        return perf.transition(self.driver, page)
+
+    def is_displayed(self, locator, timeout=None):
+        """True once the element is visible; False if it does not show up within the timeout."""
+        try:
+            self.find(locator, VISIBLE, timeout)
+            return True
+        except TimeoutException:
+            return False
@@ -0,0 +1,133 @@
+import os
+import json
+import time
+import weakref
+
+
+# quiet period after the last XHR/fetch activity that counts as "settled"; 0 turns
+# the waits into no-ops
+DEFAULT_IDLE_MS = int(os.environ.get("UI_NETWORK_IDLE_MS", "100"))
+# when nothing is in flight and nothing new starts within this window, the action
+# fetched nothing (or its calls already finished) and the wait returns
+DEFAULT_GRACE_MS = int(os.environ.get("UI_NETWORK_GRACE_MS", "30"))
+DEFAULT_TIMEOUT = 10
+POLL_INTERVAL = 0.05
+TRACKED_TYPES = frozenset({"XHR", "Fetch"})
+# requests open longer than this are treated as long-polls and no longer block idleness
+LONG_POLL_S = 5.0
+
+# chromedriver options that make the "performance" log carry the CDP Network domain only
+LOGGING_PREFS = {"performance": "ALL"}
+PERF_LOGGING_PREFS = {"enableNetwork": True, "enablePage": False}
+
+
+class _NetworkTracker:
+    """In-flight XHR/fetch requests of one browser, fed from its CDP performance log.
+
+    chromedriver buffers Network.* events in the "performance" log and every read
+    drains it, so one tracker per driver keeps the state between waits. It is the
+    only reader of that log, so it also keeps every finished request (any type)
+    as (url, encoded bytes, blocked) in `completed` until `take_requests` drains it.
+    """
+
+    def __init__(self):
+        self.inflight = {}
+        self.urls = {}
+        self.completed = []
+        self.last_activity = time.monotonic()
+        self.available = True
+
+    def busy(self, now):
+        return any(now - started < LONG_POLL_S for started in self.inflight.values())
+
+    def pump(self, driver):
+        try:
+            entries = driver.get_log("performance")
+        except Exception:
+            # performance logging not enabled (or not a Chromium browser)
+            self.available = False
+            return
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, TypeError, ValueError):
+                continue
+            method, params = message.get("method"), message.get("params") or {}
+            request_id = params.get("requestId")
+            if method == "Network.requestWillBeSent":
+                self.urls[request_id] = (params.get("request") or {}).get("url")
+                if params.get("type") in TRACKED_TYPES:
+                    self.last_activity = time.monotonic()
+                    self.inflight.setdefault(request_id, self.last_activity)
+            elif method in ("Network.loadingFinished", "Network.loadingFailed"):
+                self.completed.append((
+                    self.urls.pop(request_id, None),
+                    params.get("encodedDataLength", 0),
+                    bool(params.get("blockedReason")),
+                ))
+                if request_id in self.inflight:
+                    del self.inflight[request_id]
+                    self.last_activity = time.monotonic()
+
+
+_trackers = weakref.WeakKeyDictionary()
+
+
+def _tracker(driver):
+    try:
+        return _trackers.setdefault(driver, _NetworkTracker())
+    except TypeError:
+        return None
+
+
+def take_requests(driver):
+    """Requests finished since the last call, as (url, encoded bytes, blocked) tuples.
+
+    Empty when the browser does not expose the CDP performance log.
+    """
+    tracker = _tracker(driver)
+    if tracker is None or not tracker.available:
+        return []
+    tracker.pump(driver)
+    completed, tracker.completed = tracker.completed, []
+    return completed
+
+
+def wait_for_network_idle(driver, idle_ms=None, timeout=DEFAULT_TIMEOUT, poll=POLL_INTERVAL, grace_ms=None):
+    """Wait until the app's XHR/fetch calls triggered by the last action have settled.
+
+    Returns as soon as no call is in flight and none starts within `grace_ms`, so an
+    action whose calls already finished (or that made none) costs only the grace
+    period. Once new calls are seen, it waits for `idle_ms` of quiet after the last
+    one, which covers calls chained on each other's responses.
+
+    Returns True once settled, False on timeout or when the browser does not expose
+    the CDP performance log. It never raises, so page objects can call it after an
+    action and still rely on their explicit element waits as the real assertion.
+    """
+    idle = (DEFAULT_IDLE_MS if idle_ms is None else idle_ms) / 1000.0
+    if idle <= 0:
+        return True
+    grace = (DEFAULT_GRACE_MS if grace_ms is None else grace_ms) / 1000.0
+    tracker = _tracker(driver)
+    if tracker is None or not tracker.available:
+        return False
+    deadline = time.monotonic() + timeout
+    # events already buffered happened before this call (the action's own calls show
+    # up as in flight); activity seen after `mark` is new
+    tracker.pump(driver)
+    mark = time.monotonic()
+    while True:
+        if not tracker.available:
+            return False
+        now = time.monotonic()
+        if not tracker.busy(now):
+            if tracker.last_activity <= mark:
+                if now - mark >= grace:
+                    return True
+            elif now - tracker.last_activity >= idle:
+                return True
+        if now >= deadline:
+            return False
+        time.sleep(poll)
+        tracker.pump(driver)
@@ -1,113 +1,156 @@
-from selenium.webdriver.common.by import By
+import requests
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-
-class LoginPage:
-    def __init__(self, driver):
-        self.driver = driver
-        self.username_input = (By.ID, "login-input")
-        self.password_input = (By.ID, "password-input")
-        self.logo = (By.XPATH, "//a[@aria-label='Link to home page']")
-        self.profile_button = (By.ID, "dropdown-menu-trigger")
-        self.my_account_button = (By.XPATH, "//div[@dir='ltr']//a[1]")
-        self.logout_button = (By.XPATH, "//div[@dir='ltr']//a[2]")
-        self.login_title = (By.XPATH, "//h1[normalize-space()='Log in to SonarQube']")
-        self.login_span = (By.XPATH, "//span[@id='login']")
+
+from UI_Testing.locators import PRESENT, BasePage, by_id, css, xpath
+
+# lightweight same-origin URL used to set cookies before the app itself is loaded
+COOKIE_LANDING_PATH = "/api/system/status"
+
+
+def fetch_session_cookies(base_url, username, password, timeout=30):
+    """Log in through /api/authentication/login and return the session cookies.
+
+    The returned list (JWT-SESSION, XSRF-TOKEN, ...) is in WebDriver `add_cookie`
+    format and can be injected into any number of browsers.
+    """
+    resp = requests.post(
+        f"{base_url.rstrip('/')}/api/authentication/login",
+        data={"login": username, "password": password},
+        timeout=timeout,
+    )
+    resp.raise_for_status()
+    return [
+        {"name": c.name, "value": c.value, "path": c.path or "/", "secure": bool(c.secure)}
+        for c in resp.cookies
+    ]
+
+
+class LoginPage(BasePage):
+    # XPath is kept only where the element is identified by its text
+    username_input = by_id("login-input", "login.username")
+    password_input = by_id("password-input", "login.password")
+    logo = css("a[aria-label='Link to home page']", "nav.logo")
+    profile_button = by_id("dropdown-menu-trigger", "nav.profile")
+    my_account_button = css("div[dir='ltr'] a:nth-of-type(1)", "profile.my_account")
+    logout_button = css("div[dir='ltr'] a:nth-of-type(2)", "profile.logout")
+    login_title = xpath("//h1[normalize-space()='Log in to SonarQube']", "login.title")
+    login_span = css("span#login", "account.login")
 
     def is_on_login_page(self):
         return "SonarQube" in self.driver.title
 
     def login(self, username, password):
-        # Wait for the username and password inputs to be visible before interacting.
-        wait = WebDriverWait(self.driver, 10)
-        wait.until(EC.visibility_of_element_located(self.username_input))
-        wait.until(EC.visibility_of_element_located(self.password_input))
-        self.driver.find_element(*self.username_input).send_keys(username)
-        self.driver.find_element(*self.password_input).send_keys(password)
-        self.driver.find_element(*self.password_input).send_keys(Keys.RETURN)
+        self.type(self.username_input, username)
+        with self.transition("home"):
+            self.type(self.password_input, password + Keys.RETURN)
+            self.settle()
+
+    def login_via_api(self, base_url, username=None, password=None, cookies=None):
+        """Authenticate without the login form by injecting API session cookies.
+
+        Pass `cookies` from `fetch_session_cookies` to reuse one login across tests;
+        otherwise `username`/`password` are used to log in now. The browser is left
+        on the application origin, so the next `driver.get` loads an authenticated page.
+        """
+        if cookies is None:
+            cookies = fetch_session_cookies(base_url, username, password)
+        # cookies can only be added for the origin currently loaded
+        self.driver.get(base_url.rstrip("/") + COOKIE_LANDING_PATH)
+        for cookie in cookies:
+            self.driver.add_cookie(dict(cookie))
 
     def is_logo_displayed(self):
-        return self.driver.find_element(*self.logo).is_displayed()
+        return self.is_displayed(self.logo)
 
     def open_profile(self):
-        self.driver.find_element(*self.profile_button).click()
+        self.click(self.profile_button)
 
     def go_to_my_account(self):
-        self.driver.find_element(*self.my_account_button).click()
+        self.click(self.my_account_button)
 
     def get_logged_in_username(self):
-        return self.driver.find_element(*self.login_span).text
+        return self.text(self.login_span)
 
     def logout(self):
         self.open_profile()
-        self.driver.find_element(*self.logout_button).click()
+        self.click(self.logout_button)
 
     def is_login_page_displayed(self):
-        return self.driver.find_element(*self.login_title).is_displayed()
-    
-class ProjectPage:
-    def __init__(self, driver):
-        self.driver = driver
-        self.projects_button = (By.XPATH, "//a[normalize-space()='Projects']")
-        self.create_project_menu = (By.ID, "project-creation-menu-trigger")
-        self.local_project_button = (By.XPATH, "//a[normalize-space()='Local project']")
-        self.project_name_input = (By.ID, "project-name")
-        self.project_key_input = (By.ID, "project-key")
-        self.next_button = (By.XPATH, "//button[@type='submit']")
-        self.radio_button_global_settings = (By.XPATH, "//input[@value='general']")
-        self.create_project_button = (By.XPATH, "//span[contains(@class,'sw-mb-8') and contains(@class,'en2lust1')]//button[@type='submit']")
-        self.success_message = (By.XPATH, "//*[contains(text(), 'Your project has been created.')]")
-        self.project_link = lambda name: (By.XPATH, f"//a[normalize-space()='{name}']")
-        self.project_settings_button = (By.ID, "component-navigation-admin-trigger")
-        self.deletion_button_1 = (By.XPATH, "//a[@data-component='render-deletion-link']")
-        self.deletion_button_2 = (By.ID, "delete-project")
-        self.delete_modal = (By.XPATH, "//div[@role='alertdialog' and contains(., 'Delete Project')]")
-        self.delete_button_3 = (By.XPATH, ".//button[.//span[text()='Delete']]")
-        self.success_toast = (By.XPATH, "//*[contains(text(), 'has been successfully deleted.')]")
+        return self.is_displayed(self.login_title)
+
+
+class ProjectPage(BasePage):
+    projects_button = xpath("//a[normalize-space()='Projects']", "nav.projects")
+    create_project_menu = by_id("project-creation-menu-trigger", "projects.create_menu")
+    local_project_button = xpath("//a[normalize-space()='Local project']", "projects.create_local")
+    project_name_input = by_id("project-name", "create.name")
+    project_key_input = by_id("project-key", "create.key")
+    next_button = css("button[type='submit']", "create.next")
+    radio_button_global_settings = css("input[value='general']", "create.global_settings")
+    create_project_button = css("span.sw-mb-8.en2lust1 button[type='submit']", "create.submit")
+    success_message = xpath("//*[contains(text(), 'Your project has been created.')]", "create.success")
+    project_link_template = xpath("//a[normalize-space()='{name}']", "projects.link")
+    project_settings_button = by_id("component-navigation-admin-trigger", "project.settings")
+    deletion_button_1 = css("a[data-component='render-deletion-link']", "settings.deletion_link")
+    deletion_button_2 = by_id("delete-project", "settings.delete")
+    delete_modal = xpath("//div[@role='alertdialog' and contains(., 'Delete Project')]", "delete.modal")
+    delete_button_3 = xpath(".//button[.//span[text()='Delete']]", "delete.confirm")
+    success_toast = xpath("//*[contains(text(), 'has been successfully deleted.')]", "delete.success")
+
+    def project_link(self, name):
+        return self.project_link_template.format(name=name)
 
     def go_to_projects(self):
-        self.driver.find_element(*self.projects_button).click()
+        with self.transition("projects"):
+            self.click(self.projects_button)
+            self.settle()
 
     def start_create_project(self):
-        self.driver.find_element(*self.create_project_menu).click()
-        self.driver.find_element(*self.local_project_button).click()
+        self.click(self.create_project_menu)
+        self.click(self.local_project_button)
 
     def fill_project_details(self, name, key):
-        self.driver.find_element(*self.project_name_input).send_keys(name)
-        key_input = self.driver.find_element(*self.project_key_input)
-        key_input.clear()
-        key_input.send_keys(key)
+        self.type(self.project_name_input, name)
+        self.type(self.project_key_input, key, clear=True)
 
     def next_step(self):
-        self.driver.find_element(*self.next_button).click()
+        self.click(self.next_button)
 
     def select_global_settings(self):
-        self.driver.find_element(*self.radio_button_global_settings).click()
+        # presence only, as with the former find_element: a styled radio input may
+        # never report itself as visible/clickable
+        self.click(self.radio_button_global_settings, condition=PRESENT)
 
     def create_project(self):
-        self.driver.find_element(*self.create_project_button).click()
+        with self.transition("project_created"):
+            self.click(self.create_project_button)
+            self.settle()
 
     def wait_for_success_message(self, timeout=10):
-        wait = WebDriverWait(self.driver, timeout)
-        return wait.until(EC.visibility_of_element_located(self.success_message))
+        return self.find(self.success_message, timeout=timeout)
+
+    def is_project_listed(self, name):
+        return self.is_displayed(self.project_link(name))
 
     def open_project(self, name):
-        self.driver.find_element(*self.project_link(name)).click()
+        with self.transition("project_overview"):
+            self.click(self.project_link(name))
+            self.settle()
 
     def open_project_settings(self):
-        self.driver.find_element(*self.project_settings_button).click()
+        with self.transition("project_settings"):
+            self.click(self.project_settings_button)
+            self.settle()
 
     def start_delete_project(self):
-        self.driver.find_element(*self.deletion_button_1).click()
-        self.driver.find_element(*self.deletion_button_2).click()
+        self.click(self.deletion_button_1)
+        self.click(self.deletion_button_2)
 
     def confirm_delete_project(self, timeout=10):
-        modal = WebDriverWait(self.driver, timeout).until(
-            EC.visibility_of_element_located(self.delete_modal))
-        modal.find_element(*self.delete_button_3).click()
+        modal = self.find(self.delete_modal, timeout=timeout)
+        with self.transition("project_deleted"):
+            self.click(self.delete_button_3, within=modal)
+            self.settle()
 
     def wait_for_delete_success(self, timeout=10):
-        return WebDriverWait(self.driver, timeout).until(
-            EC.visibility_of_element_located(self.success_toast)
-        )
+        return self.find(self.success_toast, timeout=timeout)
@@ -0,0 +1,165 @@
+import os
+import json
+import time
+import statistics
+import threading
+from contextlib import contextmanager
+
+from Common.stats import summarize
+
+
+TREND_WINDOW = 10
+REGRESSION_TOLERANCE = 0.2
+
+# returns the document's time origin (changes on a hard navigation) and "now";
+# the default resource timing buffer (250 entries) fills up quickly in an SPA
+MARK_SCRIPT = """
+performance.setResourceTimingBufferSize(5000);
+return [performance.timeOrigin, performance.now()];
+"""
+
+COLLECT_SCRIPT = """
+const [origin, mark, done] = arguments;
+const hard = performance.timeOrigin !== origin;
+const since = hard ? 0 : mark;
+const resources = performance.getEntriesByType('resource').filter(e => e.startTime >= since);
+const out = {
+  hard_navigation: hard,
+  requests: resources.length,
+  transfer_kb: resources.reduce((sum, e) => sum + (e.transferSize || 0), 0) / 1024,
+  network_ms: resources.length ? Math.max(...resources.map(e => e.responseEnd)) - since : 0,
+};
+if (!hard) { done(out); return; }
+const nav = performance.getEntriesByType('navigation')[0];
+if (nav) {
+  out.ttfb_ms = nav.responseStart;
+  out.dom_content_loaded_ms = nav.domContentLoadedEventEnd;
+  out.load_ms = nav.loadEventEnd;
+}
+for (const paint of performance.getEntriesByType('paint')) {
+  out[paint.name === 'first-contentful-paint' ? 'fcp_ms' : 'fp_ms'] = paint.startTime;
+}
+// LCP is only exposed through an observer; buffered entries arrive on the next tick
+let lcp = null;
+try {
+  const observer = new PerformanceObserver(list => {
+    const entries = list.getEntries();
+    lcp = entries[entries.length - 1].startTime;
+  });
+  observer.observe({type: 'largest-contentful-paint', buffered: true});
+  setTimeout(() => { observer.disconnect(); if (lcp !== null) out.lcp_ms = lcp; done(out); }, 0);
+} catch (e) {
+  done(out);
+}
+"""
+
+
+class PagePerfRecorder:
+    """Browser-side timings per page transition, aggregated per page.
+
+    Every transition records when its last network response ended
+    (`network_ms`, from the action or from navigation start), the number of
+    requests and the transferred KB. When the transition was a full page load, the
+    Navigation Timing (TTFB, DOMContentLoaded, load) and paint metrics (FP, FCP,
+    LCP) of the new document are recorded too. SPA route changes have no
+    navigation entry or LCP of their own, so only the first group applies to them.
+
+    Collection is opt-in (`enabled`), so the extra browser round-trips cost nothing
+    by default.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._samples = {}
+
+    def record(self, page, metrics):
+        with self._lock:
+            entry = self._samples.setdefault(page, {})
+            for name, value in metrics.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    entry.setdefault(name, []).append(value)
+
+    @contextmanager
+    def transition(self, driver, page):
+        """Measure the page transition performed inside the block (no-op unless enabled)."""
+        if not self.enabled:
+            yield
+            return
+        try:
+            origin, mark = driver.execute_script(MARK_SCRIPT)
+        except Exception:
+            origin = mark = None
+        yield
+        if origin is None:
+            return
+        try:
+            self.record(page, driver.execute_async_script(COLLECT_SCRIPT, origin, mark))
+        except Exception:
+            # best-effort, like the other browser-side reporting
+            pass
+
+    def summary(self):
+        """Per page and metric: count/mean/p50/p95/p99/max (ms or KB)."""
+        with self._lock:
+            samples = {page: {k: list(v) for k, v in metrics.items()} for page, metrics in self._samples.items()}
+        return {
+            page: {name: summarize(values) for name, values in sorted(metrics.items())}
+            for page, metrics in sorted(samples.items())
+        }
+
+
+def read_trend(path):
+    """Previous trend entries (oldest first); empty when the file is missing or unreadable."""
+    entries = []
+    try:
+        with open(path) as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue
+    except OSError:
+        pass
+    return entries
+
+
+def append_trend(path, summary, **fields):
+    """Append this run's per-page medians as one JSON line (best-effort)."""
+    line = dict(fields, timestamp=time.strftime("%Y-%m-%dT%H:%M:%S%z"), pages={
+        page: {name: stats["p50"] for name, stats in metrics.items() if "p50" in stats}
+        for page, metrics in summary.items()
+    })
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "a") as f:
+            f.write(json.dumps(line) + "\n")
+    except Exception:
+        pass
+
+
+def find_regressions(summary, history, window=TREND_WINDOW, tolerance=REGRESSION_TOLERANCE):
+    """Page timings whose median is more than `tolerance` above the median of the last `window` runs."""
+    regressions = []
+    recent = history[-window:]
+    for page, metrics in summary.items():
+        for name, stats in metrics.items():
+            if not name.endswith("_ms") or "p50" not in stats:
+                continue
+            previous = [e["pages"][page][name] for e in recent if name in e.get("pages", {}).get(page, {})]
+            if not previous:
+                continue
+            baseline = statistics.median(previous)
+            if baseline > 0 and stats["p50"] > baseline * (1 + tolerance):
+                regressions.append({
+                    "page": page,
+                    "metric": name,
+                    "p50": stats["p50"],
+                    "baseline_p50": round(baseline, 2),
+                    "change": f"+{(stats['p50'] / baseline - 1):.0%}",
+                })
+    return regressions
+
+
+# process-wide, enabled and reported by the conftest
+perf = PagePerfRecorder()
@@ -4,39 +4,34 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))) # Adjust the path to include the parent directory
 
 import unittest
-from selenium import webdriver
-from selenium.webdriver.common.by import By
+import pytest
 from UI_Testing.pages import LoginPage, ProjectPage
+from Common.naming import resource_key, resource_name
 
-from selenium.webdriver.chrome.options import Options
 
-
-BASE_URL = os.environ.get('BASE_URL', 'http://localhost:9000')  # Default to localhost if not set
+@pytest.mark.authenticated
 class TestCreateDeleteProject(unittest.TestCase):
+    BASE_URL = os.environ.get('BASE_URL', 'http://localhost:9000')  # Default to localhost if not set
+    driver = None  # WebDriver from the `driver` fixture, bound by the conftest
+    # namespaced per worker/run so parallel workers never collide on one project
+    PROJECT_NAME = resource_name("My Project")
+    PROJECT_KEY = resource_key("MY_PROJECT")
+
     def setUp(self):
-        if os.environ.get("HEADLESS", "false").lower() == "true":
-            options = Options()
-            options.add_argument("--headless")
-            options.add_argument("--no-sandbox")
-            self.driver = webdriver.Chrome(options=options)
-        else:
-            self.driver = webdriver.Chrome()
-        self.driver.get(BASE_URL)
+        self.driver.get(self.BASE_URL)
         self.driver.maximize_window()
-        self.driver.implicitly_wait(5)
         
 
     def test_create_delete_project(self):
-        # Log in to SonarQube
+        # Already logged in through the API (see the `authenticated` marker)
         login_page = LoginPage(self.driver)
-        login_page.login("admin", "Mypassword1?")
         self.assertTrue(login_page.is_logo_displayed())
 
         # Use ProjectPage for project creation and deletion
         project_page = ProjectPage(self.driver)
         project_page.go_to_projects()
         project_page.start_create_project()
-        project_page.fill_project_details("My Project", "MY_PROJECT")
+        project_page.fill_project_details(self.PROJECT_NAME, self.PROJECT_KEY)
         project_page.next_step()
         project_page.select_global_settings()
         project_page.create_project()
@@ -45,17 +40,13 @@ class TestCreateDeleteProject(unittest.TestCase):
 
         # Navigate to the project page and verify
         project_page.go_to_projects()
-        self.assertTrue(self.driver.find_element(By.XPATH, "//a[normalize-space()='My Project']").is_displayed())
-        project_page.open_project("My Project")
+        self.assertTrue(project_page.is_project_listed(self.PROJECT_NAME))
+        project_page.open_project(self.PROJECT_NAME)
         project_page.open_project_settings()
         project_page.start_delete_project()
         project_page.confirm_delete_project()
         success_toast = project_page.wait_for_delete_success()
-        self.assertIn('Project "My Project" has been successfully deleted.', success_toast.text)
-
-    def tearDown(self):
-        self.driver.quit()
-        
+        self.assertIn(f'Project "{self.PROJECT_NAME}" has been successfully deleted.', success_toast.text)
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
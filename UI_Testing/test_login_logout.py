@@ -4,24 +4,15 @@ import sys
 import os
 #for the debug mode, i had to add this line to ensure the parent directory is included in the path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))) # Adjust the path to include the parent directory
-from selenium import webdriver
 from UI_Testing.pages import LoginPage
-from selenium.webdriver.chrome.options import Options
-
-BASE_URL = os.environ.get('BASE_URL', 'http://localhost:9000')  # Default to localhost if not set
 
 class TestLoginLogout(unittest.TestCase):
+    BASE_URL = os.environ.get('BASE_URL', 'http://localhost:9000')  # Default to localhost if not set
+    driver = None  # WebDriver from the `driver` fixture, bound by the conftest
+
     def setUp(self):
-        if os.environ.get("HEADLESS", "false").lower() == "true":
-            options = Options()
-            options.add_argument("--headless")
-            options.add_argument("--no-sandbox")
-            self.driver = webdriver.Chrome(options=options)
-        else:
-            self.driver = webdriver.Chrome()
-        self.driver.get(BASE_URL)
+        self.driver.get(self.BASE_URL)
         self.driver.maximize_window()
-        self.driver.implicitly_wait(5)
         self.login_page = LoginPage(self.driver)
 
     def test_page_title(self):
@@ -39,8 +30,5 @@ class TestLoginLogout(unittest.TestCase):
         self.login_page.logout()
         self.assertTrue(self.login_page.is_login_page_displayed())
 
-    def tearDown(self):
-        self.driver.quit()
-
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,2 @@
+# Plugins shared by the API and UI suites
+pytest_plugins = ["Common.durations", "Common.sharding", "Common.regressions"]